@@ -0,0 +1,59 @@
+"""add_users_created_at_index
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-05-04 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, Sequence[str], None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The user list pages on (created_at, id), like projects and sprints; a NULL
+# created_at would fall out of the keyset comparison and could not go in a
+# cursor.
+
+
+def upgrade() -> None:
+    # last_modified_on is NOT NULL and is the best guess we have
+    op.execute("UPDATE boards.users SET created_at = last_modified_on WHERE created_at IS NULL")
+    op.alter_column(
+        "users", "created_at",
+        existing_type=sa.TIMESTAMP(),
+        existing_server_default=sa.text("now()"),
+        nullable=False,
+        schema="boards",
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at_id", "users", ["created_at", "id"],
+            schema="boards",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_created_at_id", table_name="users",
+            schema="boards",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column(
+        "users", "created_at",
+        existing_type=sa.TIMESTAMP(),
+        existing_server_default=sa.text("now()"),
+        nullable=True,
+        schema="boards",
+    )
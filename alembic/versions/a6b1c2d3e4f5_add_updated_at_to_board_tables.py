@@ -0,0 +1,37 @@
+"""add_updated_at_to_board_tables
+
+Revision ID: a6b1c2d3e4f5
+Revises: f5a6b1c2d3e4
+Create Date: 2026-03-23 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a6b1c2d3e4f5"
+down_revision: Union[str, Sequence[str], None] = "f5a6b1c2d3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["projects", "sprints", "user_stories", "tasks"]
+
+
+def upgrade() -> None:
+    # NOW() is evaluated once for the ALTER, so existing rows get the
+    # migration time without a table rewrite.  ETags only need a value that
+    # changes from here on.
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.TIMESTAMP(), nullable=False,
+                      server_default=sa.text("NOW()")),
+            schema="boards",
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at", schema="boards")
@@ -0,0 +1,171 @@
+"""add_sprint_daily_stats
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b1c2d3e4f5
+Create Date: 2026-04-06 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c8d9e0f1a2"
+down_revision: Union[str, Sequence[str], None] = "a6b1c2d3e4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One row per (sprint, day, kind, status) holding that day's net change in
+# item count and estimated hours.  Statement-level triggers with transition
+# tables fold every INSERT/UPDATE/DELETE on tasks and user_stories into it
+# with one grouped upsert per statement, so bulk writes cost one upsert, not
+# one per row.
+#
+# The price is contention: every task or story write in a sprint updates the
+# same few rows for that day (one per kind and status), so concurrent writes
+# to one sprint queue on those row locks until each transaction commits.
+# Rows are upserted in key order, so two statements touching several of
+# them lock them in the same order and wait instead of deadlocking.
+
+_UPSERT = """
+        INSERT INTO boards.sprint_daily_stats AS s (sprint_id, day, kind, status, items, hours)
+        SELECT d.sprint_id, CURRENT_DATE, d.kind, d.status, SUM(d.items), SUM(d.hours)
+        FROM ({deltas}) AS d
+        GROUP BY d.sprint_id, d.kind, d.status
+        HAVING SUM(d.items) <> 0 OR SUM(d.hours) <> 0
+        ORDER BY d.sprint_id, d.kind, d.status
+        ON CONFLICT (sprint_id, day, kind, status) DO UPDATE
+        SET items = s.items + EXCLUDED.items, hours = s.hours + EXCLUDED.hours;
+"""
+
+
+def _task_rows(table: str, sign: str) -> str:
+    # A task counts towards the sprint its story is in now
+    return f"""
+            SELECT us.sprint_id, 'task' AS kind, COALESCE(t.status, '') AS status,
+                   {sign}1 AS items, {sign}COALESCE(t.estimated_hours, 0) AS hours
+            FROM {table} t JOIN boards.user_stories us ON us.id = t.user_story_id"""
+
+
+def _story_rows(table: str, sign: str) -> str:
+    return f"""
+            SELECT sprint_id, 'story' AS kind, COALESCE(status, '') AS status,
+                   {sign}1 AS items, 0 AS hours
+            FROM {table}"""
+
+
+def _moved_story_tasks(side: str, sign: str) -> str:
+    # Tasks follow their story when it changes sprint
+    return f"""
+            SELECT {side}.sprint_id, 'task', COALESCE(t.status, ''),
+                   {sign}1, {sign}COALESCE(t.estimated_hours, 0)
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id AND n.sprint_id IS DISTINCT FROM o.sprint_id
+            JOIN boards.tasks t ON t.user_story_id = o.id"""
+
+
+def _trigger_function(name: str, on_insert: str, on_delete: str, on_update: str) -> str:
+    # Transition tables only exist for their own event, so each branch names
+    # just the ones it has.
+    return f"""
+    CREATE OR REPLACE FUNCTION boards.{name}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' THEN
+        {_UPSERT.format(deltas=on_insert)}
+      ELSIF TG_OP = 'DELETE' THEN
+        {_UPSERT.format(deltas=on_delete)}
+      ELSE
+        {_UPSERT.format(deltas=on_update)}
+      END IF;
+      RETURN NULL;
+    END
+    $$
+    """
+
+
+def _create_triggers(table: str, function: str) -> None:
+    transitions = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for event, referencing in transitions.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_sprint_stats_{event.lower()}
+            AFTER {event} ON boards.{table}
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION boards.{function}()
+        """)
+
+
+def create_functions() -> None:
+    op.execute(_trigger_function(
+        "tasks_sprint_stats",
+        on_insert=_task_rows("new_rows", ""),
+        on_delete=_task_rows("old_rows", "-"),
+        on_update=_task_rows("old_rows", "-") + "\n            UNION ALL" + _task_rows("new_rows", ""),
+    ))
+    op.execute(_trigger_function(
+        "user_stories_sprint_stats",
+        on_insert=_story_rows("new_rows", ""),
+        on_delete=_story_rows("old_rows", "-"),
+        on_update="\n            UNION ALL".join([
+            _story_rows("old_rows", "-"),
+            _story_rows("new_rows", ""),
+            _moved_story_tasks("o", "-"),
+            _moved_story_tasks("n", ""),
+        ]),
+    ))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sprint_daily_stats",
+        sa.Column("sprint_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hours", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("sprint_id", "day", "kind", "status"),
+        sa.ForeignKeyConstraint(["sprint_id"], ["boards.sprints.id"], ondelete="CASCADE"),
+        schema="boards",
+    )
+
+    create_functions()
+    # CREATE TRIGGER locks out writes to both tables until this migration
+    # commits, so nothing can slip in between the triggers and the backfill.
+    _create_triggers("tasks", "tasks_sprint_stats")
+    _create_triggers("user_stories", "user_stories_sprint_stats")
+
+    # History before this migration is unknown: record the current state on
+    # today's date, or on the end date of sprints that are already over.
+    op.execute("""
+        INSERT INTO boards.sprint_daily_stats (sprint_id, day, kind, status, items, hours)
+        SELECT us.sprint_id, LEAST(CURRENT_DATE, COALESCE(sp.end_date, CURRENT_DATE)), 'task',
+               COALESCE(t.status, ''), COUNT(*), COALESCE(SUM(t.estimated_hours), 0)
+        FROM boards.tasks t
+        JOIN boards.user_stories us ON us.id = t.user_story_id
+        JOIN boards.sprints sp ON sp.id = us.sprint_id
+        GROUP BY us.sprint_id, sp.end_date, COALESCE(t.status, '')
+    """)
+    op.execute("""
+        INSERT INTO boards.sprint_daily_stats (sprint_id, day, kind, status, items, hours)
+        SELECT us.sprint_id, LEAST(CURRENT_DATE, COALESCE(sp.end_date, CURRENT_DATE)), 'story',
+               COALESCE(us.status, ''), COUNT(*), 0
+        FROM boards.user_stories us
+        JOIN boards.sprints sp ON sp.id = us.sprint_id
+        GROUP BY us.sprint_id, sp.end_date, COALESCE(us.status, '')
+    """)
+
+
+def downgrade() -> None:
+    for table in ("tasks", "user_stories"):
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_sprint_stats_{event} ON boards.{table}")
+    op.execute("DROP FUNCTION IF EXISTS boards.tasks_sprint_stats()")
+    op.execute("DROP FUNCTION IF EXISTS boards.user_stories_sprint_stats()")
+    op.drop_table("sprint_daily_stats", schema="boards")
@@ -0,0 +1,66 @@
+"""add_search_vectors
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-04-13 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d9e0f1a2b3"
+down_revision: Union[str, Sequence[str], None] = "b7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Titles weigh more than descriptions in the ranking.  Must match
+# SEARCH_VECTOR in app/core/search.py, which the models and queries use.
+VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+TABLES = [
+    ("tasks", "ix_tasks_search_vector"),
+    ("user_stories", "ix_user_stories_search_vector"),
+]
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table under an exclusive
+    # lock; on large tables run this in a quiet window.
+    for table, _ in TABLES:
+        op.add_column(
+            table,
+            sa.Column("search_vector", postgresql.TSVECTOR(),
+                      sa.Computed(VECTOR, persisted=True)),
+            schema="boards",
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for table, name in TABLES:
+            op.create_index(
+                name, table, ["search_vector"],
+                schema="boards",
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name in reversed(TABLES):
+            op.drop_index(
+                name, table_name=table,
+                schema="boards",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    for table, _ in reversed(TABLES):
+        op.drop_column(table, "search_vector", schema="boards")
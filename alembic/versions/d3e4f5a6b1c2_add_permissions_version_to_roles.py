@@ -0,0 +1,30 @@
+"""add_permissions_version_to_roles
+
+Revision ID: d3e4f5a6b1c2
+Revises: c2d3e4f5a6b1
+Create Date: 2026-03-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d3e4f5a6b1c2"
+down_revision: Union[str, Sequence[str], None] = "c2d3e4f5a6b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "roles",
+        sa.Column("permissions_version", sa.Integer(), nullable=False,
+                  server_default=sa.text("1")),
+        schema="boards",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("roles", "permissions_version", schema="boards")
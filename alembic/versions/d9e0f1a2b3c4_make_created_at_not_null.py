@@ -0,0 +1,45 @@
+"""make_created_at_not_null
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-04-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d9e0f1a2b3c4"
+down_revision: Union[str, Sequence[str], None] = "c8d9e0f1a2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The project and sprint lists page on (created_at, id); a NULL created_at
+# would fall out of the keyset comparison and could not go in a cursor.
+TABLES = ["projects", "sprints"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # updated_at is NOT NULL and is the best guess we have
+        op.execute(f"UPDATE boards.{table} SET created_at = updated_at WHERE created_at IS NULL")
+        op.alter_column(
+            table, "created_at",
+            existing_type=sa.TIMESTAMP(),
+            existing_server_default=sa.text("now()"),
+            nullable=False,
+            schema="boards",
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(
+            table, "created_at",
+            existing_type=sa.TIMESTAMP(),
+            existing_server_default=sa.text("now()"),
+            nullable=True,
+            schema="boards",
+        )
@@ -0,0 +1,35 @@
+"""upsert_sprint_stats_in_key_order
+
+Revision ID: e1f2a3b4c5d6
+Revises: d9e0f1a2b3c4
+Create Date: 2026-04-27 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "d9e0f1a2b3c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The sprint_daily_stats trigger functions from b7c8d9e0f1a2 upserted their
+# grouped rows in no particular order, so two multi-row statements on one
+# sprint could lock its stats rows in opposite orders and deadlock.  Databases
+# created before b7c8d9e0f1a2 gained its ORDER BY get the ordered functions
+# here; the triggers call them by name and need no change.
+
+
+def _sprint_stats_migration():
+    return context.script.get_revision("b7c8d9e0f1a2").module
+
+
+def upgrade() -> None:
+    _sprint_stats_migration().create_functions()
+
+
+def downgrade() -> None:
+    # The unordered upsert adds up to the same totals; nothing to undo
+    pass
@@ -0,0 +1,54 @@
+"""add_foreign_key_indexes
+
+Revision ID: e4f5a6b1c2d3
+Revises: d3e4f5a6b1c2
+Create Date: 2026-03-09 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f5a6b1c2d3"
+down_revision: Union[str, Sequence[str], None] = "d3e4f5a6b1c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns).  The (parent_id, status) composites also serve
+# plain parent_id lookups and FK checks, so those get no separate index.
+INDEXES = [
+    ("ix_sprints_project_id_status", "sprints", ["project_id", "status"]),
+    ("ix_user_stories_sprint_id_status", "user_stories", ["sprint_id", "status"]),
+    ("ix_tasks_user_story_id_status", "tasks", ["user_story_id", "status"]),
+    ("ix_tasks_assignee_id", "tasks", ["assignee_id"]),
+    ("ix_user_stories_assignee_id", "user_stories", ["assignee_id"]),
+    ("ix_projects_created_by", "projects", ["created_by"]),
+    ("ix_users_role_id", "users", ["role_id"]),
+    ("ix_users_last_modified_by", "users", ["last_modified_by"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    # if_not_exists lets a rerun pick up after an interrupted build, but an
+    # INVALID leftover index must be dropped by hand first.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                schema="boards",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                schema="boards",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""add_list_sort_key_indexes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-05-04 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, Sequence[str], None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns): sort keys of the keyset-paginated project and
+# sprint lists, so each page is an index range scan.  created_at is NOT NULL
+# since d9e0f1a2b3c4.
+INDEXES = [
+    ("ix_projects_created_at_id", "projects", ["created_at", "id"]),
+    ("ix_sprints_created_at_id", "sprints", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                schema="boards",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                schema="boards",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,40 @@
+"""add_last_sprint_number_to_projects
+
+Revision ID: f5a6b1c2d3e4
+Revises: e4f5a6b1c2d3
+Create Date: 2026-03-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f5a6b1c2d3e4"
+down_revision: Union[str, Sequence[str], None] = "e4f5a6b1c2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects",
+        sa.Column("last_sprint_number", sa.Integer(), nullable=False,
+                  server_default=sa.text("0")),
+        schema="boards",
+    )
+    # Continue numbering where MAX(sprint_number) left off
+    op.execute("""
+        UPDATE boards.projects p
+        SET    last_sprint_number = s.max_number
+        FROM  (SELECT project_id, MAX(sprint_number) AS max_number
+               FROM   boards.sprints
+               WHERE  sprint_number IS NOT NULL
+               GROUP  BY project_id) s
+        WHERE  s.project_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "last_sprint_number", schema="boards")
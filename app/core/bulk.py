@@ -0,0 +1,192 @@
+"""Set-based bulk create/update/delete shared by the task and story routers."""
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import MAX_BULK_ITEMS
+
+
+@dataclass(frozen=True)
+class ForeignKeyCheck:
+    """A column whose referenced row must exist before we write it."""
+
+    column: str
+    target: Any  # mapped primary-key attribute, e.g. UserStory.id
+    label: str
+
+
+@dataclass(frozen=True)
+class BulkSpec:
+    model: Any
+    label: str
+    not_null: tuple[str, ...]
+    foreign_keys: tuple[ForeignKeyCheck, ...]
+    # (child FK attribute, message) for rows that block a delete
+    delete_guards: tuple[tuple[Any, str], ...] = ()
+
+
+@dataclass
+class BulkOutcome:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+    def error(self, op: str, index: int, detail: str, id: Optional[Any] = None) -> None:
+        # Kept JSON-safe: errors may end up in an HTTPException detail
+        self.errors.append({
+            "op": op,
+            "index": index,
+            "id": str(id) if id is not None else None,
+            "detail": detail,
+        })
+
+
+async def _existing(db: AsyncSession, target, ids: set) -> set:
+    if not ids:
+        return set()
+    result = await db.execute(select(target).where(target.in_(ids)))
+    return set(result.scalars().all())
+
+
+async def apply_bulk(
+    db: AsyncSession,
+    spec: BulkSpec,
+    creates: list[BaseModel],
+    updates: list[BaseModel],
+    deletes: list,
+    atomic: bool,
+) -> BulkOutcome:
+    """Validate every item with a handful of set-based lookups, then apply the
+    valid ones in one transaction.
+
+    Invalid items are reported per item and skipped; with ``atomic`` any error
+    rolls the whole batch back with a 400 instead.
+    """
+    if len(creates) + len(updates) + len(deletes) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+
+    model = spec.model
+    outcome = BulkOutcome()
+    create_rows = [item.model_dump() for item in creates]
+    patches = [item.model_dump(exclude_unset=True) for item in updates]
+
+    # ─── Validation: one query per foreign key, one for update targets ─────
+    referenced: dict[str, set] = {}
+    for fk in spec.foreign_keys:
+        wanted = {row[fk.column] for row in create_rows + patches if row.get(fk.column) is not None}
+        referenced[fk.column] = await _existing(db, fk.target, wanted)
+
+    def fk_error(row: dict) -> Optional[str]:
+        for column in spec.not_null:
+            if column in row and row[column] is None:
+                return f"{column} cannot be null"
+        for fk in spec.foreign_keys:
+            value = row.get(fk.column)
+            if value is not None and value not in referenced[fk.column]:
+                return f"{fk.label} not found"
+        return None
+
+    valid_creates = []
+    for index, row in enumerate(create_rows):
+        detail = fk_error(row)
+        if detail:
+            outcome.error("create", index, detail)
+        else:
+            valid_creates.append(row)
+
+    update_ids = {patch["id"] for patch in patches}
+    found = await _existing(db, model.id, update_ids)
+    seen: set = set()
+    grouped: dict[tuple, list] = {}
+    for index, patch in enumerate(patches):
+        row_id = patch.pop("id")
+        detail = fk_error(patch)
+        if row_id not in found:
+            detail = f"{spec.label} not found"
+        elif row_id in seen:
+            detail = "Duplicate id in updates"
+        if detail:
+            outcome.error("update", index, detail, row_id)
+            continue
+        seen.add(row_id)
+        grouped.setdefault(tuple(sorted(patch.items())), []).append(row_id)
+
+    # A repeated id is one delete, reported once at its first index
+    delete_ids: dict[Any, int] = {}
+    for index, row_id in enumerate(deletes):
+        delete_ids.setdefault(row_id, index)
+    blocked: dict[Any, str] = {}
+    for child_fk, message in spec.delete_guards:
+        for parent_id in await _existing(db, child_fk, set(delete_ids)):
+            blocked[parent_id] = message
+    valid_deletes = []
+    for row_id, index in delete_ids.items():
+        if row_id in blocked:
+            outcome.error("delete", index, blocked[row_id], row_id)
+        else:
+            valid_deletes.append(row_id)
+
+    if atomic and outcome.errors:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Bulk request rejected", "errors": outcome.errors},
+        )
+
+    # ─── Apply: multi-row INSERT ... RETURNING, one UPDATE per distinct patch ──
+    try:
+        if valid_creates:
+            result = await db.execute(
+                insert(model).returning(model, sort_by_parameter_order=True), valid_creates
+            )
+            outcome.created = list(result.scalars().all())
+
+        for patch, ids in grouped.items():
+            if not patch:
+                continue
+            result = await db.execute(
+                update(model)
+                .where(model.id.in_(ids))
+                .values(**dict(patch))
+                .returning(model)
+                .execution_options(synchronize_session=False)
+            )
+            outcome.updated.extend(result.scalars().all())
+        # Empty patches are no-ops but still report the current row
+        untouched = grouped.get((), [])
+        if untouched:
+            result = await db.execute(select(model).where(model.id.in_(untouched)))
+            outcome.updated.extend(result.scalars().all())
+
+        if valid_deletes:
+            result = await db.execute(
+                delete(model)
+                .where(model.id.in_(valid_deletes))
+                .returning(model.id)
+                .execution_options(synchronize_session=False)
+            )
+            removed = set(result.scalars().all())
+            for row_id, index in delete_ids.items():
+                if row_id in removed:
+                    outcome.deleted.append(row_id)
+                elif row_id not in blocked:
+                    outcome.error("delete", index, f"{spec.label} not found", row_id)
+
+        if atomic and outcome.errors:
+            await db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Bulk request rejected", "errors": outcome.errors},
+            )
+        await db.commit()
+    except IntegrityError as exc:
+        # A concurrent write invalidated our checks; nothing was applied.
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Bulk request conflicted with a concurrent change") from exc
+
+    return outcome
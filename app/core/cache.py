@@ -0,0 +1,91 @@
+"""Small in-process caches used by the auth and routing layers."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Protocol
+
+
+class _Reports(Protocol):
+    def stats(self) -> dict[str, Any]: ...
+
+
+# Every cache registers itself here so its counters can be reported together.
+_registry: dict[str, _Reports] = {}
+
+
+def register(name: str, cache: _Reports) -> None:
+    """Include ``cache.stats()`` in :func:`cache_stats` under ``name``."""
+    _registry[name] = cache
+
+
+class TTLCache:
+    """Size-bounded LRU where every entry also expires after ``ttl`` seconds.
+
+    Not thread-safe: it is only ever touched from the event loop of a single
+    worker process.  A ``ttl`` or ``maxsize`` of 0 disables caching entirely.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, *, report: bool = True):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if report:
+            register(name, self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        if self._data:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Return the counters of every registered cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -7,7 +7,119 @@ SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production-super-secret-
 ALGORITHM: str = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+# SQLAlchemy connection pool, per worker process.  At most
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections are open at once; a request
+# waits DB_POOL_TIMEOUT seconds for one before failing.  Connections older
+# than DB_POOL_RECYCLE seconds are replaced, which keeps us ahead of idle
+# cutoffs on hosted Postgres; pre-ping catches the ones that were cut anyway.
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Connections the whole service may hold on the primary (e.g. the server's
+# max_connections minus headroom for migrations and psql), shared by the
+# WEB_CONCURRENCY worker processes; gunicorn.conf.py sets WEB_CONCURRENCY
+# for its workers.  The per-worker pool above is shrunk to fit; 0 = no cap.
+WEB_CONCURRENCY: int = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+if DB_MAX_CONNECTIONS > 0:
+    _per_worker = max(1, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)
+    DB_POOL_SIZE = min(DB_POOL_SIZE, _per_worker)
+    DB_MAX_OVERFLOW = max(0, min(DB_MAX_OVERFLOW, _per_worker - DB_POOL_SIZE))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Prepared statements cached per connection.  Set to 0 behind PgBouncer in
+# transaction pooling mode, which cannot keep prepared statements.
+DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# Sent as server settings on connect.  Timeout in milliseconds, 0 disables it.
+DB_APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "plannr-backend")
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Development aid: log statements slower than DB_SLOW_QUERY_MS with their
+# route, statements repeated DB_N_PLUS_ONE_THRESHOLD times in one request
+# (likely N+1) and implicit relationship lazy loads.  See app/core/diagnostics.py.
+DB_DIAGNOSTICS: bool = os.getenv("DB_DIAGNOSTICS", "false").lower() == "true"
+DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Pooled connections opened, and hot statements prepared on them, at startup
+# (at most DB_POOL_SIZE; 0 skips the warm-up).  A warm-up that takes longer
+# than DB_WARMUP_TIMEOUT_SECONDS is abandoned and startup goes on.
+DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
+DB_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("DB_WARMUP_TIMEOUT_SECONDS", "10"))
+
+# Read replicas (comma-separated URLs).  GET/HEAD requests are served from a
+# healthy replica unless the caller wrote within READ_YOUR_WRITES_SECONDS;
+# everything else, and every request while no replica is healthy, uses the
+# primary.  A replica is checked every REPLICA_HEALTH_INTERVAL_SECONDS and
+# dropped while it lags more than REPLICA_MAX_LAG_SECONDS behind.
+DATABASE_REPLICA_URLS: list[str] = [
+    u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+]
+READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+REPLICA_HEALTH_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+# Redis that records recent writers for every worker (needs the ``redis``
+# package).  Unset, a write only pins its author on the worker that served it.
+READ_YOUR_WRITES_REDIS_URL: str = os.getenv("READ_YOUR_WRITES_REDIS_URL", "")
+
+# Opt-in: embed role id, a permissions bitmask and the role's permissions
+# version in access tokens so requests can be authorized without the DB.
+STATELESS_AUTH: bool = os.getenv("STATELESS_AUTH", "false").lower() == "true"
+# How long a worker trusts its copy of the role → permissions_version map.
+ROLE_VERSION_TTL_SECONDS: int = int(os.getenv("ROLE_VERSION_TTL_SECONDS", "30"))
+
 GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
+# Google's signing keys for ID tokens; override to point at a local key server.
+GOOGLE_JWKS_URL: str = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+
+# bcrypt cost factor.  Existing hashes with a different cost are rehashed
+# transparently on the user's next successful login.
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads that run bcrypt off the event loop, and how many more calls may
+# wait for a free thread before /auth requests are refused with a 503.
+PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+
+# In-process cache of authenticated users, keyed by user id.
+# Set either value to 0 to disable the cache.
+PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024"))
+
+# Read-through cache of GET responses for projects, sprints, stories and tasks.
+# "memory" keeps a per-worker LRU: a write only invalidates the worker that
+# served it, so other workers may serve the old body for up to the TTL.
+# "redis" shares entries and invalidations between workers (needs the
+# ``redis`` package and RESPONSE_CACHE_URL).  "none" disables the cache.
+RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "5"))
+RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "2048"))
+
+# Keyset pagination for list endpoints (?limit=&cursor=).  Lists are only
+# paged when asked; DEFAULT_PAGE_LIMIT applies to a cursor sent without a limit.
+DEFAULT_PAGE_LIMIT: int = int(os.getenv("DEFAULT_PAGE_LIMIT", "100"))
+MAX_PAGE_LIMIT: int = int(os.getenv("MAX_PAGE_LIMIT", "500"))
+
+# Upper bound on creates + updates + deletes in one bulk request.
+MAX_BULK_ITEMS: int = int(os.getenv("MAX_BULK_ITEMS", "1000"))
+
+# Rows fetched per server-side cursor round trip by the export endpoints.
+EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Task/story statuses that count as finished in burndown and velocity.
+# Decided when reading, so changing it needs no backfill.
+ANALYTICS_DONE_STATUSES: frozenset[str] = frozenset(
+    s.strip() for s in os.getenv("ANALYTICS_DONE_STATUSES", "DONE").split(",") if s.strip()
+)
+# Default and maximum number of sprints in a velocity report.
+VELOCITY_DEFAULT_SPRINTS: int = int(os.getenv("VELOCITY_DEFAULT_SPRINTS", "6"))
+VELOCITY_MAX_SPRINTS: int = int(os.getenv("VELOCITY_MAX_SPRINTS", "52"))
+
+# Per-route latency, SQL counters and pool gauges at GET /metrics (Prometheus
+# text format).  When METRICS_TOKEN is set, scrapers must send it as a bearer token.
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
 
 # Comma-separated list of allowed CORS origins.
 # Set the CORS_ORIGINS env var in production (e.g. "https://yourapp.com").
@@ -0,0 +1,76 @@
+"""Single-statement writes: UPDATE/DELETE ... WHERE id = :id RETURNING.
+
+Both helpers commit, map "no row matched" to a 404 and constraint violations
+to the given status, so routes need one round trip instead of a SELECT, the
+write and a refresh.
+"""
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def update_returning(
+    db: AsyncSession,
+    model,
+    row_id: Any,
+    values: dict[str, Any],
+    label: str,
+    *extra: Any,
+    conflict: str = "Update violates a constraint",
+) -> Row:
+    """Apply ``values`` to one row and return ``(row, *extra)`` as of after the update.
+
+    ``extra`` columns are evaluated in RETURNING; a scalar subquery there sees
+    the row as it was before the statement, which is how callers read old values.
+    An empty ``values`` writes nothing and returns the current row.
+    """
+    if values:
+        stmt = (
+            update(model)
+            .where(model.id == row_id)
+            .values(**values)
+            .returning(model, *extra)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(model, *extra).where(model.id == row_id)
+    # The row may already be in the session (e.g. the caller's own user)
+    stmt = stmt.execution_options(populate_existing=True)
+    try:
+        row = (await db.execute(stmt)).one_or_none()
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=conflict) from exc
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"{label} not found")
+    return row
+
+
+async def delete_returning(
+    db: AsyncSession,
+    model,
+    row_id: Any,
+    label: str,
+    *columns: Any,
+    conflict: str = "Row is still referenced",
+) -> Row:
+    """Delete one row and return ``columns`` of it (its id by default)."""
+    stmt = (
+        delete(model)
+        .where(model.id == row_id)
+        .returning(*(columns or (model.id,)))
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        row = (await db.execute(stmt)).one_or_none()
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=conflict) from exc
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"{label} not found")
+    return row
@@ -1,40 +1,297 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from jose import jwt
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from dotenv import load_dotenv
 import os
 
-load_dotenv()
+from app.core.config import (
+  DATABASE_REPLICA_URLS,
+  DB_APPLICATION_NAME,
+  DB_DIAGNOSTICS,
+  DB_MAX_CONNECTIONS,
+  DB_MAX_OVERFLOW,
+  DB_POOL_PRE_PING,
+  DB_POOL_RECYCLE,
+  DB_POOL_SIZE,
+  DB_POOL_TIMEOUT,
+  DB_STATEMENT_CACHE_SIZE,
+  DB_STATEMENT_TIMEOUT_MS,
+  METRICS_ENABLED,
+  READ_YOUR_WRITES_REDIS_URL,
+  READ_YOUR_WRITES_SECONDS,
+  REPLICA_HEALTH_INTERVAL_SECONDS,
+  REPLICA_MAX_LAG_SECONDS,
+  WEB_CONCURRENCY,
+)
+from app.core import diagnostics
+from app.core.metrics import instrument_engine
+
+logger = logging.getLogger("uvicorn.error")
 
-_raw_database_url = os.getenv("DATABASE_URL", "")
 
-# Render (and many other hosts) provide "postgresql://" URLs.
-# SQLAlchemy's asyncpg driver requires "postgresql+asyncpg://".
-if _raw_database_url.startswith("postgresql://"):
-    DATABASE_URL = _raw_database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif _raw_database_url.startswith("postgres://"):
+def _asyncpg_url(raw_url: str) -> str:
+  # Render (and many other hosts) provide "postgresql://" URLs.
+  # SQLAlchemy's asyncpg driver requires "postgresql+asyncpg://".
+  if raw_url.startswith("postgresql://"):
+    return raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+  if raw_url.startswith("postgres://"):
     # Heroku-style shorthand
-    DATABASE_URL = _raw_database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-else:
-    DATABASE_URL = _raw_database_url
+    return raw_url.replace("postgres://", "postgresql+asyncpg://", 1)
+  return raw_url
+
+
+DATABASE_URL = _asyncpg_url(os.getenv("DATABASE_URL", ""))
 
 class Base(DeclarativeBase):
   pass
 
-# Only require SSL for remote databases (Render, Heroku, etc.).
-# Local PostgreSQL instances typically don't support SSL.
-_is_remote_db = "localhost" not in DATABASE_URL and "127.0.0.1" not in DATABASE_URL
-_connect_args = {"ssl": "require"} if _is_remote_db else {}
+_server_settings = {"application_name": DB_APPLICATION_NAME}
+if DB_STATEMENT_TIMEOUT_MS > 0:
+  _server_settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+
+POOL_OPTIONS = {
+  "pool_size": DB_POOL_SIZE,
+  "max_overflow": DB_MAX_OVERFLOW,
+  "pool_timeout": DB_POOL_TIMEOUT,
+  "pool_recycle": DB_POOL_RECYCLE,
+  "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
 
-engine = create_async_engine(
-    DATABASE_URL,
+def build_engine(url: str = DATABASE_URL, **overrides) -> AsyncEngine:
+  """Create an engine with the configured pool; ``overrides`` replace pool options."""
+  # Only require SSL for remote databases (Render, Heroku, etc.).
+  # Local PostgreSQL instances typically don't support SSL.
+  is_remote_db = "localhost" not in url and "127.0.0.1" not in url
+  return create_async_engine(
+    url,
     echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-    connect_args=_connect_args,
-)
+    connect_args={
+      **({"ssl": "require"} if is_remote_db else {}),
+      # SQLAlchemy's per-connection prepared statement cache, and asyncpg's own
+      "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+      "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+      "server_settings": _server_settings,
+    },
+    **{**POOL_OPTIONS, **overrides},
+  )
+
+
+def describe_engine() -> str:
+  """One-line summary of the effective connection settings, without credentials."""
+  options = " ".join(f"{key}={value}" for key, value in POOL_OPTIONS.items())
+  summary = (
+    f"{engine.url.render_as_string(hide_password=True)} {options} "
+    f"statement_cache_size={DB_STATEMENT_CACHE_SIZE} "
+    + " ".join(f"{key}={value}" for key, value in _server_settings.items())
+  )
+  if DB_MAX_CONNECTIONS > 0:
+    summary += f" max_connections={DB_MAX_CONNECTIONS} shared by {WEB_CONCURRENCY} worker(s)"
+  if replicas.members:
+    summary += f" replicas={len(replicas.members)} read_your_writes={READ_YOUR_WRITES_SECONDS}s"
+  return summary
+
+
+engine = build_engine()
+if METRICS_ENABLED:
+  instrument_engine(engine, "primary")
+if DB_DIAGNOSTICS:
+  diagnostics.instrument_engine(engine)
+  diagnostics.watch_lazy_loads()
 
 AsyncSessionLocal = async_sessionmaker(
   engine, expire_on_commit=False
 )
 
-async def get_db():
-  async with AsyncSessionLocal() as session:
+
+# ─── Read replicas ────────────────────────────────────────────────────────────
+
+# Seconds behind the primary; 0 when the URL points at a primary (e.g. the
+# same database under a second URL) or nothing has been replayed yet.
+_LAG_SQL = text(
+  "SELECT CASE WHEN pg_is_in_recovery() "
+  "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+  "ELSE 0 END"
+)
+
+
+class Replica:
+  def __init__(self, url: str):
+    self.engine = build_engine(_asyncpg_url(url))
+    self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False, info={"replica": True})
+    # Unhealthy until the first check passes
+    self.healthy = False
+    self.lag: Optional[float] = None
+    if METRICS_ENABLED:
+      instrument_engine(self.engine, self.name)
+    if DB_DIAGNOSTICS:
+      diagnostics.instrument_engine(self.engine)
+
+    @event.listens_for(self.engine.sync_engine, "handle_error")
+    def _on_error(context):
+      if context.is_disconnect:
+        self.healthy = False
+
+  @property
+  def name(self) -> str:
+    return self.engine.url.render_as_string(hide_password=True)
+
+  async def _measure_lag(self) -> float:
+    async with self.engine.connect() as conn:
+      return float((await conn.execute(_LAG_SQL)).scalar_one())
+
+  async def check(self) -> None:
+    try:
+      self.lag = await asyncio.wait_for(self._measure_lag(), REPLICA_HEALTH_INTERVAL_SECONDS)
+    except Exception as exc:
+      if self.healthy:
+        logger.warning("Replica %s failed its health check: %r", self.name, exc)
+      self.healthy, self.lag = False, None
+      return
+    healthy = self.lag <= REPLICA_MAX_LAG_SECONDS
+    if healthy != self.healthy:
+      logger.info("Replica %s is %s (lag %.1fs)", self.name, "up" if healthy else "lagging", self.lag)
+    self.healthy = healthy
+
+
+class ReplicaSet:
+  """Round-robin over healthy replicas, checked in the background."""
+
+  def __init__(self, urls: list[str]):
+    self.members = [Replica(url) for url in urls]
+    self._turn = itertools.count()
+    self._task: Optional[asyncio.Task] = None
+
+  def pick(self) -> Optional[Replica]:
+    healthy = [replica for replica in self.members if replica.healthy]
+    if not healthy:
+      return None
+    return healthy[next(self._turn) % len(healthy)]
+
+  async def _monitor(self) -> None:
+    while True:
+      await asyncio.gather(*(replica.check() for replica in self.members))
+      await asyncio.sleep(REPLICA_HEALTH_INTERVAL_SECONDS)
+
+  def start(self) -> None:
+    if self.members and self._task is None:
+      self._task = asyncio.create_task(self._monitor())
+
+  async def close(self) -> None:
+    if self._task is not None:
+      self._task.cancel()
+      self._task = None
+    for replica in self.members:
+      await replica.engine.dispose()
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS)
+
+
+class RecentWriters:
+  """Users who wrote recently and must read from the primary until their window ends.
+
+  Kept in Redis when ``url`` is given, so every worker sees them; otherwise
+  per worker (a write on one worker does not pin the user on the others).
+  """
+
+  def __init__(self, window: float, url: str = ""):
+    self.window = window
+    self._until: dict[str, float] = {}
+    self._redis = None
+    if url and DATABASE_REPLICA_URLS:
+      try:
+        import redis.asyncio as redis
+      except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+          "READ_YOUR_WRITES_REDIS_URL needs the 'redis' package (pip install redis)"
+        ) from exc
+      self._redis = redis.from_url(url)
+
+  async def mark(self, user_id) -> None:
+    if not replicas.members or self.window <= 0:
+      return
+    if self._redis is not None:
+      try:
+        await self._redis.set(f"rw:{user_id}", b"1", ex=max(1, round(self.window)))
+        return
+      except Exception:
+        logger.warning("Could not record a write in Redis", exc_info=True)
+    now = time.monotonic()
+    self._until = {uid: until for uid, until in self._until.items() if until > now}
+    self._until[str(user_id)] = now + self.window
+
+  async def active(self, user_id) -> bool:
+    if self._redis is not None:
+      try:
+        return await self._redis.get(f"rw:{user_id}") is not None
+      except Exception:
+        return True  # unsure, so read from the primary
+    return self._until.get(str(user_id), 0.0) > time.monotonic()
+
+  async def close(self) -> None:
+    if self._redis is not None:
+      await self._redis.aclose()
+      self._redis = None
+
+
+recent_writers = RecentWriters(READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_REDIS_URL)
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _caller_id(request: Request) -> Optional[str]:
+  # Routing only: the token is verified by the auth dependencies later, and
+  # a forged one can do no more than force reads onto the primary.
+  scheme, _, token = request.headers.get("authorization", "").partition(" ")
+  if scheme.lower() != "bearer" or not token:
+    return None
+  try:
+    return jwt.get_unverified_claims(token).get("sub")
+  except Exception:
+    return None
+
+
+async def session_factory(request: Request) -> async_sessionmaker:
+  """The sessionmaker a request should use: a replica for safe reads, else the primary."""
+  user_id = _caller_id(request)
+  if request.method not in _SAFE_METHODS:
+    if user_id:
+      await recent_writers.mark(user_id)
+    return AsyncSessionLocal
+  if not replicas.members or (user_id and await recent_writers.active(user_id)):
+    return AsyncSessionLocal
+  replica = replicas.pick()
+  return replica.sessionmaker if replica else AsyncSessionLocal
+
+
+async def get_db(request: Request):
+  async with (await session_factory(request))() as session:
+    yield session
+
+
+def reads_from_replica(session: AsyncSession) -> bool:
+  """True if ``session`` is bound to a replica, whose rows may lag the primary."""
+  return bool(session.info.get("replica"))
+
+
+@asynccontextmanager
+async def primary_session(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+  """``session`` itself on the primary, else a short-lived primary session.
+
+  For reads that fill process-wide caches: those outlive the request, so
+  they must not hold rows from before a write the replica has not replayed.
+  """
+  if not reads_from_replica(session):
     yield session
+    return
+  async with AsyncSessionLocal() as primary:
+    yield primary
@@ -1,19 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_SIZE
+from app.core.database import get_db, primary_session
+from app.core.permissions import PERMISSION_BITS, mask_to_permissions_map, role_registry
 from app.core.security import decode_access_token
 from app.models.user import User
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Column snapshots of authenticated users, keyed by str(user.id).
+# The cache is per worker process: writes made through another worker are
+# only picked up once the entry's TTL runs out.
+principal_cache = TTLCache(
+    "principal", maxsize=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS
+)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+_USER_COLUMNS = tuple(attr.key for attr in User.__mapper__.column_attrs)
+
+
+def invalidate_principal(user_id) -> None:
+    """Drop a cached user; call this after any write to that user row."""
+    principal_cache.invalidate(str(user_id))
+
+
+def _decode_credentials(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,21 +47,113 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id: str = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+
+async def _load_user(user_id: str, db: AsyncSession) -> User:
+    snapshot = principal_cache.get(user_id)
+    if snapshot is None:
+        # The snapshot outlives this request, so it is read from the primary
+        # even when the request itself reads from a replica.
+        async with primary_session(db) as session:
+            result = await session.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        snapshot = {key: getattr(user, key) for key in _USER_COLUMNS}
+        principal_cache.set(user_id, snapshot)
+        if session is db:
+            return user
+
+    # Rebuild a clean, persistent instance in this session without a query.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    payload = _decode_credentials(credentials)
+    return await _load_user(payload["sub"], db)
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Identity and grants of the caller, as far as the access token knows."""
+
+    user_id: str
+    role_id: Optional[str]
+    role_name: Optional[str]
+    permissions_mask: int
+    # False for tokens issued without embedded grants (STATELESS_AUTH off)
+    stateless: bool
+
+    @property
+    def permissions(self) -> dict[str, bool]:
+        return mask_to_permissions_map(self.permissions_mask)
+
+    def has(self, permission: str) -> bool:
+        return bool(self.permissions_mask & PERMISSION_BITS.get(permission, 0))
+
+
+async def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> TokenPrincipal:
+    """Authorize from the token's embedded grants instead of the users table.
+
+    The DB is only touched when the per-worker role registry refreshes or
+    recompiles a role whose version moved, or for tokens without embedded
+    grants.
+    Changing a user's role takes effect at their next login.
+    """
+    payload = _decode_credentials(credentials)
+
+    if "pm" not in payload:
+        user = await _load_user(payload["sub"], db)
+        role_id = str(user.role_id) if user.role_id else None
+        role = await role_registry.get(db, role_id)
+        return TokenPrincipal(
+            payload["sub"], role_id, role.name if role else None, role.mask if role else 0, stateless=False
         )
 
-    return user
+    role_id = payload.get("rid")
+    role_name, mask = payload.get("rn"), payload["pm"]
+    if role_id:
+        version = await role_registry.current(db, role_id)
+        if version is None:
+            mask = 0
+        elif version != payload.get("pv"):
+            role = await role_registry.get(db, role_id)
+            role_name, mask = (role.name, role.mask) if role else (None, 0)
+    else:
+        mask = 0
+    return TokenPrincipal(payload["sub"], role_id, role_name, mask, stateless=True)
+
+
+def require_permission(permission: str):
+    """Dependency factory: 403 unless the caller's role grants ``permission``."""
+    if permission not in PERMISSION_BITS:
+        raise ValueError(f"Unknown permission: {permission}")
+
+    async def _check(principal: TokenPrincipal = Depends(get_token_principal)) -> TokenPrincipal:
+        if not principal.has(permission):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission: {permission}",
+            )
+        return principal
+
+    return _check
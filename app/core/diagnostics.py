@@ -0,0 +1,153 @@
+"""Query diagnostics for development: slow statements, likely N+1s, lazy loads.
+
+Enabled with DB_DIAGNOSTICS.  Every statement slower than DB_SLOW_QUERY_MS
+is logged with the route that issued it.  At the end of a request, any
+statement text run DB_N_PLUS_ONE_THRESHOLD times or more is logged as a
+likely N+1; since parameters are bound, a per-row query shows up as the same
+text repeated.  Implicit relationship loads (``lazy="select"`` attributes
+touched without a ``selectinload``) are logged as they happen.
+
+``assert_max_queries`` is for tests and works whether or not diagnostics
+are enabled.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.config import DB_N_PLUS_ONE_THRESHOLD, DB_SLOW_QUERY_MS
+
+logger = logging.getLogger("uvicorn.error")
+
+# Longest statement text written to the log
+_MAX_STATEMENT_LENGTH = 500
+
+
+class _RequestTrace:
+    __slots__ = ("scope", "shapes")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.shapes: Counter[str] = Counter()
+
+    @property
+    def route(self) -> str:
+        # FastAPI puts the matched route on the scope before the endpoint runs
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', None) or self.scope['path']}"
+
+
+_current: ContextVar[Optional[_RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > _MAX_STATEMENT_LENGTH:
+        return statement[:_MAX_STATEMENT_LENGTH] + "…"
+    return statement
+
+
+def _where() -> str:
+    trace = _current.get()
+    return trace.route if trace is not None else "outside a request"
+
+
+def _finish_statement(statement: str, context) -> None:
+    # Failed statements are finished from handle_error, so a start time is
+    # never left behind
+    started = getattr(context, "diagnostics_started", None)
+    if started is None:
+        return
+    context.diagnostics_started = None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    trace = _current.get()
+    if trace is not None:
+        trace.shapes[statement] += 1
+    if elapsed_ms >= DB_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.0f ms) in %s: %s", elapsed_ms, _where(), _shorten(statement))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Log slow statements on ``engine`` and count statement shapes per request."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context.diagnostics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _finish_statement(statement, context)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _on_error(exception_context):
+        if exception_context.execution_context is not None:
+            _finish_statement(exception_context.statement, exception_context.execution_context)
+
+
+def watch_lazy_loads() -> None:
+    """Log every implicit relationship load, with the object and route that caused it."""
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _on_execute(orm_execute_state):
+        state = orm_execute_state.lazy_loaded_from
+        if state is not None:
+            logger.warning(
+                "Implicit lazy load from %s in %s; add a selectinload: %s",
+                state.class_.__name__, _where(), _shorten(str(orm_execute_state.statement)),
+            )
+
+
+class DiagnosticsMiddleware:
+    """Pure ASGI middleware that reports repeated statements once the request is done."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = _RequestTrace(scope)
+        token = _current.set(trace)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            for statement, count in trace.shapes.items():
+                if count >= DB_N_PLUS_ONE_THRESHOLD:
+                    logger.warning(
+                        "Likely N+1 in %s: same statement ran %d times: %s",
+                        trace.route, count, _shorten(statement),
+                    )
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine: Optional[AsyncEngine] = None) -> Iterator[list[str]]:
+    """Fail with the statements run if the block executes more than ``limit`` of them.
+
+    Counts on every engine unless ``engine`` is given::
+
+        with assert_max_queries(3):
+            response = await client.get(f"/sprints/project/{project_id}")
+    """
+    statements: list[str] = []
+    target = engine.sync_engine if engine is not None else Engine
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(target, "before_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", _count)
+    if len(statements) > limit:
+        listing = "\n".join(f"{i}. {_shorten(s)}" for i, s in enumerate(statements, 1))
+        raise AssertionError(f"{len(statements)} queries, expected at most {limit}:\n{listing}")
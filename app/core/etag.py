@@ -0,0 +1,84 @@
+"""Strong ETags and If-None-Match handling for GET routes.
+
+Scoped list routes (a project's sprints, a story's tasks, ...) derive their
+validator from ``count(*)``, ``max(updated_at)`` and ``sum(updated_at)`` over
+the scope, one aggregate query that hydrates no ORM object; when the
+client's copy is current they return 304 straight away.  The unscoped lists have no
+validator: the aggregate would scan the whole table on every request.
+Detail routes hash the loaded row's version column.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def client_has_etag(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already covers ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def conditional(request: Request, response: Response, *parts: Any) -> Optional[Response]:
+    """Return a 304 if the client already holds this version, else tag ``response``.
+
+    ``parts`` must change whenever the representation does; the request path
+    and query string are always mixed in.
+    """
+    etag = make_etag(request.url.path, request.url.query, *parts)
+    if client_has_etag(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but always revalidate it
+    response.headers["Cache-Control"] = "private, no-cache"
+    return None
+
+
+async def scope_conditional(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    version_column: InstrumentedAttribute,
+    *criteria: Any,
+) -> Optional[Response]:
+    """Conditional GET for a list scope, validated by aggregates of ``version_column``.
+
+    ``updated_at`` is the writing transaction's start time, so a write that
+    commits after a later-started one leaves ``count`` and ``max`` as they
+    were.  The sum still moves: every insert, update or delete changes it.
+    """
+    stmt = select(
+        func.count(), func.max(version_column), func.sum(func.extract("epoch", version_column))
+    ).select_from(version_column.class_)
+    if criteria:
+        stmt = stmt.where(*criteria)
+    count, latest, total = (await db.execute(stmt)).one()
+    return conditional(request, response, count, latest, total)
+
+
+async def row_conditional(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    version_column: InstrumentedAttribute,
+    *criteria: Any,
+) -> Optional[Response]:
+    """Conditional GET for one row; a missing row is left for the route to 404."""
+    result = await db.execute(select(version_column).where(*criteria))
+    version = result.scalar_one_or_none()
+    if version is None:
+        return None
+    return conditional(request, response, version)
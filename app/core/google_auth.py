@@ -0,0 +1,127 @@
+"""Local verification of Google ID tokens against Google's cached JWKS."""
+import asyncio
+import re
+import time
+from typing import Optional
+
+import httpx
+from jose import JWTError, jwt
+
+from app.core.config import GOOGLE_CLIENT_ID, GOOGLE_JWKS_URL
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when the key server sends no usable Cache-Control max-age.
+_DEFAULT_MAX_AGE = 300
+# A token with an unknown key id forces a refresh, but no more often than this,
+# so garbage tokens cannot turn into a request flood against the key server.
+# Also how long stale keys are served after a failed refresh.
+_MIN_REFRESH_INTERVAL = 30
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+class GoogleTokenError(Exception):
+    """The ID token is malformed, forged, expired or not meant for this app."""
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled, app-lifetime client used for outbound HTTP calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class GoogleKeySet:
+    """In-memory JWKS that honours Cache-Control and refreshes on kid miss."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, kid: str) -> dict:
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is not None and now < self._expires_at:
+            return key
+
+        async with self._lock:
+            # Another request may have refreshed while we waited for the lock.
+            key = self._keys.get(kid)
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            if (key is None or expired) and (
+                expired or now - self._refreshed_at >= _MIN_REFRESH_INTERVAL
+            ):
+                await self._refresh()
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise GoogleTokenError("Unknown Google signing key")
+        return key
+
+    async def _refresh(self) -> None:
+        try:
+            response = await get_http_client().get(self.url)
+            response.raise_for_status()
+            keys = response.json()["keys"]
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            if self._keys:
+                # Keep serving the previous keys rather than failing every login,
+                # and wait a while before trying the key server again.
+                self._refreshed_at = time.monotonic()
+                self._expires_at = self._refreshed_at + _MIN_REFRESH_INTERVAL
+                return
+            raise GoogleTokenError("Could not fetch Google signing keys") from exc
+
+        max_age = _DEFAULT_MAX_AGE
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        if match:
+            max_age = int(match.group(1))
+            age = response.headers.get("age", "")
+            if age.isdigit():
+                max_age = max(0, max_age - int(age))
+
+        self._keys = {k["kid"]: k for k in keys if "kid" in k}
+        self._refreshed_at = time.monotonic()
+        self._expires_at = self._refreshed_at + max_age
+
+
+google_keys = GoogleKeySet(GOOGLE_JWKS_URL)
+
+
+async def verify_google_id_token(token: str) -> dict:
+    """Check signature, expiry, issuer and audience; return the token's claims."""
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as exc:
+        raise GoogleTokenError("Invalid Google token") from exc
+
+    key = await google_keys.get(header.get("kid", ""))
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[key.get("alg", "RS256")],
+            issuer=GOOGLE_ISSUERS,
+            options={"verify_aud": False, "verify_at_hash": False},
+        )
+    except JWTError as exc:
+        raise GoogleTokenError("Invalid Google token") from exc
+
+    if GOOGLE_CLIENT_ID and claims.get("aud") != GOOGLE_CLIENT_ID:
+        raise GoogleTokenError("Google token audience mismatch")
+    return claims
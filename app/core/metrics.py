@@ -0,0 +1,237 @@
+"""Request and database metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records latency, status and in-flight counts per
+route template, and ``instrument_engine`` counts the SQL statements and
+database time of the request they run in.  Recording only bumps counters in
+plain dicts; everything is formatted when ``/metrics`` is scraped, where the
+pool gauges and cache counters are read as well.
+
+Values are per worker process, like ``/stats/cache``: with several workers
+each scrape sees whichever worker answered.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import cache_stats
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements per request
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Requests that match no route share one label, so 404 scans cannot grow the series
+UNMATCHED = "<unmatched>"
+
+# Cache stats that only ever grow; the other numeric ones are exported as gauges
+_CACHE_COUNTERS = {"hits", "misses", "not_modified", "evictions", "invalidations", "errors"}
+
+
+class Histogram:
+    """Bucket counts for one label set; ``buckets`` are upper bounds."""
+
+    __slots__ = ("buckets", "counts", "total", "sum")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+
+class _RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the middleware for the duration of a request.  SQLAlchemy runs the
+# engine events in a greenlet sharing the request's context, so they find it.
+_current: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Registry:
+    def __init__(self):
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.queries: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        # Statements outside any request (health checks, lifespan, scripts)
+        self.background_queries = 0
+        self.background_db_seconds = 0.0
+        self.engines: dict[str, AsyncEngine] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: _RequestStats) -> None:
+        key = (method, route)
+        self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+        for series, buckets, value in (
+            (self.latency, LATENCY_BUCKETS, seconds),
+            (self.queries, QUERY_BUCKETS, stats.queries),
+            (self.db_time, LATENCY_BUCKETS, stats.db_seconds),
+        ):
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        _family(lines, "http_requests_in_progress", "gauge", "Requests being served.",
+                [((), self.in_flight)])
+        _family(lines, "http_requests_total", "counter", "Requests served, by route and status.",
+                [((("method", m), ("route", r), ("status", s)), n) for (m, r, s), n in self.requests.items()])
+        _histograms(lines, "http_request_duration_seconds", "Time to serve a request.", self.latency)
+        _histograms(lines, "http_request_db_queries", "SQL statements executed per request.", self.queries)
+        _histograms(lines, "http_request_db_seconds", "Time spent in SQL statements per request.", self.db_time)
+        _family(lines, "db_background_queries_total", "counter", "SQL statements executed outside requests.",
+                [((), self.background_queries)])
+        _family(lines, "db_background_seconds_total", "counter", "Time spent in SQL statements outside requests.",
+                [((), self.background_db_seconds)])
+        self._render_pools(lines)
+        self._render_caches(lines)
+        return "\n".join(lines) + "\n"
+
+    def _render_pools(self, lines: list[str]) -> None:
+        gauges = {
+            "db_pool_size": ("Connections the pool keeps open.", "size"),
+            "db_pool_checked_out": ("Connections in use.", "checkedout"),
+            "db_pool_checked_in": ("Idle connections in the pool.", "checkedin"),
+            "db_pool_overflow": ("Connections open beyond the pool size (negative while below it).", "overflow"),
+        }
+        pools = [(name, engine.sync_engine.pool) for name, engine in self.engines.items()]
+        for metric, (help_text, method) in gauges.items():
+            _family(lines, metric, "gauge", help_text, [
+                ((("engine", name),), getattr(pool, method)())
+                for name, pool in pools if hasattr(pool, method)
+            ])
+
+    def _render_caches(self, lines: list[str]) -> None:
+        families: dict[str, list] = {}
+        for cache, stats in cache_stats().items():
+            for key, value in stats.items():
+                if key == "hit_ratio" or isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"cache_{key}_total" if key in _CACHE_COUNTERS else f"cache_{key}"
+                families.setdefault(name, []).append(((("cache", cache),), value))
+        for name, samples in families.items():
+            kind = "counter" if name.endswith("_total") else "gauge"
+            _family(lines, name, kind, f"In-process cache {name[6:].removesuffix('_total')}.", samples)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(pairs: Iterable[tuple[str, Any]]) -> str:
+    text = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return f"{{{text}}}" if text else ""
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str, samples: list) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+
+def _histograms(lines: list[str], name: str, help_text: str, series: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in series.items():
+        labels = (("method", method), ("route", route))
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.total}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.total}")
+
+
+registry = Registry()
+
+
+def _record_statement(context) -> None:
+    started = getattr(context, "metrics_started", None)
+    if started is None:
+        return
+    context.metrics_started = None
+    seconds = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+    else:
+        registry.background_queries += 1
+        registry.background_db_seconds += seconds
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Count statements and database time on ``engine`` and report its pool as ``name``."""
+    registry.engines[name] = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, which lives exactly as long as the
+        # statement, so nothing is left behind on the pooled connection
+        context.metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _record_statement(context)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _on_error(exception_context):
+        # A statement that raised still spent its time in the database
+        if exception_context.execution_context is not None:
+            _record_statement(exception_context.execution_context)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are timed to their last byte."""
+
+    def __init__(self, app, *, skip: Iterable[str] = ()):
+        self.app = app
+        self.skip = frozenset(skip)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = _RequestStats()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _current.set(stats)
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            registry.in_flight -= 1
+            _current.reset(token)
+            # Set on the scope by FastAPI once a route matched
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED
+            registry.record(scope["method"], path, status, seconds, stats)
@@ -0,0 +1,98 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are ordered on a unique key such as ``(created_at, id)`` or ``task_no``
+and continue with ``WHERE key > :last_key`` instead of OFFSET, so every page
+costs the same index range scan however deep the client goes.  The response
+body stays a plain list; the next page is announced through a ``Link:
+<...>; rel="next"`` header and ``X-Next-Cursor``.  A request with neither
+``limit`` nor ``cursor`` gets the whole list, in the same order, as before
+pagination existed.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+
+PAGINATION_HEADERS = ["Link", "X-Next-Cursor"]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(keys):
+            raise ValueError("cursor does not match the sort key")
+        values = []
+        for key, value in zip(keys, raw):
+            python_type = key.type.python_type
+            if python_type in (datetime, date):
+                values.append(python_type.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+class Pagination:
+    """Dependency carrying ``limit``/``cursor``; use as ``page: Pagination = Depends()``."""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    ):
+        if limit is None and cursor is not None:
+            limit = DEFAULT_PAGE_LIMIT
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.cursor = cursor
+
+    def apply(self, stmt: Select, keys: Sequence[InstrumentedAttribute]) -> Select:
+        """Order ``stmt`` by ``keys``, seek past the cursor and fetch one extra row."""
+        stmt = stmt.order_by(*keys)
+        if self.limit is None:
+            return stmt
+        if self.cursor:
+            values = decode_cursor(self.cursor, keys)
+            if len(keys) == 1:
+                stmt = stmt.where(keys[0] > values[0])
+            else:
+                stmt = stmt.where(tuple_(*keys) > tuple_(*values))
+        return stmt.limit(self.limit + 1)
+
+    def finish(self, rows: Sequence[Any], keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+        """Trim the look-ahead row and advertise the next page when there is one."""
+        rows = list(rows)
+        if self.limit is not None and len(rows) > self.limit:
+            rows = rows[: self.limit]
+            next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+            next_url = self.request.url.include_query_params(cursor=next_cursor, limit=self.limit)
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+            self.response.headers["X-Next-Cursor"] = next_cursor
+        return rows
+
+    async def fetch(
+        self, db: AsyncSession, stmt: Select, keys: Sequence[InstrumentedAttribute]
+    ) -> list[Any]:
+        """Run ``stmt`` for the requested page and return its ORM objects."""
+        result = await db.execute(self.apply(stmt, keys))
+        return self.finish(result.scalars().all(), keys)
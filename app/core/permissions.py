@@ -1,9 +1,18 @@
 """Shared permission constants and helpers for the RBAC system."""
 from __future__ import annotations
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Optional
 
-if TYPE_CHECKING:
-    from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import ROLE_VERSION_TTL_SECONDS
+from app.core.database import primary_session
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.role_permission import RolePermission
 
 ALL_PERMISSIONS: list[str] = [
     "project:read",
@@ -20,19 +29,129 @@ ALL_PERMISSIONS: list[str] = [
     "user:write",
 ]
 
+# Bit positions follow ALL_PERMISSIONS; only ever append new permissions so
+# masks embedded in already-issued tokens keep their meaning.
+PERMISSION_BITS: dict[str, int] = {perm: 1 << i for i, perm in enumerate(ALL_PERMISSIONS)}
+
+
+def permissions_to_mask(granted: Iterable[str]) -> int:
+    """Pack granted permission names into a bitmask (unknown names are ignored)."""
+    mask = 0
+    for perm in granted:
+        mask |= PERMISSION_BITS.get(perm, 0)
+    return mask
+
+
+def mask_to_permissions_map(mask: int) -> dict[str, bool]:
+    """Inverse of permissions_to_mask: every permission name mapped to a bool."""
+    return {perm: bool(mask & bit) for perm, bit in PERMISSION_BITS.items()}
+
+
+# Shared by every user without a role; do not mutate
+NO_PERMISSIONS: dict[str, bool] = mask_to_permissions_map(0)
+
+
+@dataclass(frozen=True)
+class CompiledRole:
+    """A role's name and grants, compiled once per permissions_version."""
+
+    id: str
+    name: str
+    version: int
+    mask: int
+    granted: frozenset[str]
+
+    @cached_property
+    def permissions(self) -> dict[str, bool]:
+        # Built once per compiled role and shared; do not mutate
+        return mask_to_permissions_map(self.mask)
+
 
-def build_permissions_map(user: "User") -> dict[str, bool]:
-    """Return a dict with all 12 permission keys.
+class RoleRegistry:
+    """Per-worker registry of every role, compiled to a permissions bitmask.
 
-    Each value is *True* only if the user's role has a row for that permission
-    with is_granted=True.  Works safely when relationships are not loaded.
+    The id → (name, permissions_version) map is refreshed with one small query
+    at most once per ROLE_VERSION_TTL_SECONDS, so rendering a user or checking
+    a token's version is normally free.  A role is recompiled only when its
+    version moves; role writes in this worker invalidate it immediately, other
+    workers notice within the TTL.  Loads always go to the primary, even for
+    a request on a replica, so a lagging replica cannot undo an invalidation.
     """
-    granted: set[str] = set()
-    role = getattr(user, "role_info", None)
-    if role is not None:
-        for rp in getattr(role, "role_permissions", []):
-            if getattr(rp, "is_granted", False):
-                perm = getattr(rp, "permission", None)
-                if perm is not None:
-                    granted.add(perm.name)
-    return {perm: (perm in granted) for perm in ALL_PERMISSIONS}
+
+    # Unknown role ids (e.g. a role created by another worker) force a refresh,
+    # but no more often than this.
+    _MISS_REFRESH_SECONDS = 1.0
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._roles: dict[str, tuple[str, int]] = {}
+        self._refreshed_at = float("-inf")
+        self._compiled: dict[str, CompiledRole] = {}
+
+    def invalidate(self, role_id: Optional[str] = None) -> None:
+        """Forget one compiled role (or all of them) and re-read the version map."""
+        if role_id is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(str(role_id), None)
+        self._refreshed_at = float("-inf")
+
+    async def _refresh(self, db: AsyncSession, role_ids: Iterable[str]) -> None:
+        age = time.monotonic() - self._refreshed_at
+        missing = any(role_id not in self._roles for role_id in role_ids)
+        if age >= self.ttl or (missing and age >= self._MISS_REFRESH_SECONDS):
+            async with primary_session(db) as session:
+                result = await session.execute(select(Role.id, Role.role_name, Role.permissions_version))
+                self._roles = {str(rid): (name, version) for rid, name, version in result.all()}
+            self._refreshed_at = time.monotonic()
+
+    async def prime(self, db: AsyncSession) -> None:
+        """Load the version map and compile every role, e.g. at startup."""
+        self._refreshed_at = float("-inf")
+        await self._refresh(db, ())
+        await self.get_many(db, list(self._roles))
+
+    async def current(self, db: AsyncSession, role_id: str) -> Optional[int]:
+        """Return the role's current version, or None if the role is gone."""
+        await self._refresh(db, (role_id,))
+        entry = self._roles.get(role_id)
+        return entry[1] if entry else None
+
+    async def get_many(self, db: AsyncSession, role_ids: Iterable[Optional[str]]) -> dict[str, CompiledRole]:
+        """Compiled roles by id; stale or unseen roles are compiled in one query."""
+        wanted = {str(role_id) for role_id in role_ids if role_id}
+        if not wanted:
+            return {}
+        await self._refresh(db, wanted)
+
+        stale = [
+            role_id for role_id in wanted
+            if role_id in self._roles
+            and (role_id not in self._compiled or self._compiled[role_id].version != self._roles[role_id][1])
+        ]
+        if stale:
+            async with primary_session(db) as session:
+                result = await session.execute(
+                    select(RolePermission.role_id, Permission.name)
+                    .join(Permission, RolePermission.permission_id == Permission.id)
+                    .where(RolePermission.role_id.in_(stale), RolePermission.is_granted.is_(True))
+                )
+                rows = result.all()
+            granted: dict[str, list[str]] = {role_id: [] for role_id in stale}
+            for role_id, name in rows:
+                granted[str(role_id)].append(name)
+            for role_id, names in granted.items():
+                name, version = self._roles[role_id]
+                known = frozenset(perm for perm in names if perm in PERMISSION_BITS)
+                self._compiled[role_id] = CompiledRole(role_id, name, version, permissions_to_mask(known), known)
+
+        return {role_id: self._compiled[role_id] for role_id in wanted if role_id in self._roles}
+
+    async def get(self, db: AsyncSession, role_id: Optional[str]) -> Optional[CompiledRole]:
+        """The compiled role, or None for no role / a deleted role."""
+        if not role_id:
+            return None
+        return (await self.get_many(db, (role_id,))).get(str(role_id))
+
+
+role_registry = RoleRegistry(ttl=ROLE_VERSION_TTL_SECONDS)
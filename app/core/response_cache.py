@@ -0,0 +1,236 @@
+"""Read-through cache of serialized GET responses.
+
+An entry is stored under the request path and query string plus the current
+*generation* of every scope it depends on (``"task:<id>"``,
+``"story-tasks:<story id>"``, ...).  Write handlers bump the generations of
+the scopes they touched once their transaction has committed, which makes
+every dependent entry unreachable at once; the orphans simply age out.
+Generations are read before the database is queried, so a response computed
+from pre-write data can only ever be stored under a superseded key.  That
+does not hold for a lagging read replica, so responses read from one are
+served from the cache but never stored.
+
+Backends only need ``get``/``set`` for entries plus ``generations``/``bump``
+for scopes, so tests can swap ``response_cache.backend`` for a stand-in.
+"""
+import itertools
+import json
+import logging
+import secrets
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Protocol
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache, register
+from app.core.config import (
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_MAX_SIZE,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_URL,
+)
+from app.core.database import reads_from_replica
+from app.core.etag import client_has_etag
+from app.core.serialization import Serializer
+
+logger = logging.getLogger(__name__)
+
+# Response headers worth replaying on a hit
+_STORED_HEADERS = ("ETag", "Cache-Control", "Link", "X-Next-Cursor")
+
+
+class Backend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    async def generations(self, scopes: list[str]) -> list[int]: ...
+
+    async def bump(self, scopes: list[str]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Per-worker LRU of entries plus an LRU of scope generations.
+
+    A generation that falls out of its LRU is re-seeded from a process-wide
+    sequence, never reset, so an evicted scope cannot resurrect old entries.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._entries = TTLCache("response_entries", maxsize, ttl, report=False)
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._max_generations = maxsize * 4
+        self._seq = itertools.count(1)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries.set(key, value)
+
+    def _seed(self, scope: str) -> None:
+        self._generations[scope] = next(self._seq)
+        self._generations.move_to_end(scope)
+        while len(self._generations) > self._max_generations:
+            self._generations.popitem(last=False)
+
+    async def generations(self, scopes: list[str]) -> list[int]:
+        for scope in scopes:
+            if scope in self._generations:
+                self._generations.move_to_end(scope)
+            else:
+                self._seed(scope)
+        return [self._generations[scope] for scope in scopes]
+
+    async def bump(self, scopes: list[str]) -> None:
+        for scope in scopes:
+            self._seed(scope)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Entries and generations shared by every worker through Redis."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis needs the 'redis' package (pip install redis)"
+            ) from exc
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"rc:entry:{key}")
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._redis.set(f"rc:entry:{key}", value, ex=ttl)
+
+    async def generations(self, scopes: list[str]) -> list[int]:
+        keys = [f"rc:gen:{scope}" for scope in scopes]
+        values = await self._redis.mget(keys)
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if missing:
+            # Random seeds so a scope evicted by Redis never reuses a generation
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in missing:
+                    pipe.set(key, secrets.randbits(48), nx=True)
+                await pipe.execute()
+            values = await self._redis.mget(keys)
+        return [int(value) for value in values]
+
+    async def bump(self, scopes: list[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(f"rc:gen:{scope}")
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _make_backend() -> Optional[Backend]:
+    if RESPONSE_CACHE_BACKEND == "none" or RESPONSE_CACHE_TTL_SECONDS <= 0 or RESPONSE_CACHE_MAX_SIZE <= 0:
+        return None
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(RESPONSE_CACHE_URL)
+    return MemoryBackend(RESPONSE_CACHE_MAX_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+
+
+class ResponseCache:
+    def __init__(self, name: str, backend: Optional[Backend], ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        register(name, self)
+
+    async def lookup(
+        self, request: Request, scopes: Iterable[str], db: AsyncSession
+    ) -> tuple[Optional[Response], Optional[str]]:
+        """Return ``(cached response, None)`` on a hit, else ``(None, key to store under)``.
+
+        A hit whose ETag the client already holds is answered with a bare 304.
+        ``db`` is the session the route reads with; on a replica a miss
+        returns no key, so nothing is stored.
+        """
+        if self.backend is None:
+            return None, None
+        scopes = list(scopes)
+        try:
+            generations = await self.backend.generations(scopes)
+            key = f"{request.url.path}?{request.url.query}|" + ".".join(map(str, generations))
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("response cache lookup failed", exc_info=True)
+            return None, None
+        if raw is None:
+            self.misses += 1
+            return None, None if reads_from_replica(db) else key
+
+        self.hits += 1
+        head, body = raw.split(b"\n", 1)
+        headers = json.loads(head)
+        etag = headers.get("ETag")
+        if etag and client_has_etag(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag}), None
+        return Response(content=body, media_type="application/json", headers=headers), None
+
+    async def store(self, key: Optional[str], response: Response, serializer: Serializer, payload: Any) -> Response:
+        """Serialize ``payload`` once, cache it under ``key`` and return it as the response.
+
+        ``response`` is the route's injected Response; the validator and
+        pagination headers already set on it are stored with the body.
+        """
+        body = serializer.dump_json(payload)
+        headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        if key is not None:
+            try:
+                await self.backend.set(key, json.dumps(headers).encode() + b"\n" + body, self.ttl)
+            except Exception:
+                self.errors += 1
+                logger.warning("response cache store failed", exc_info=True)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *scopes: str) -> None:
+        """Drop every entry that depends on any of ``scopes``.  Call after commit."""
+        if self.backend is None or not scopes:
+            return
+        try:
+            unique = list(dict.fromkeys(scopes))
+            await self.backend.bump(unique)
+            self.invalidations += len(unique)
+        except Exception:
+            # Entries still expire after the TTL
+            self.errors += 1
+            logger.warning("response cache invalidation failed", exc_info=True)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+response_cache = ResponseCache("responses", _make_backend(), RESPONSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,30 @@
+"""Full-text search over task and user story titles and descriptions.
+
+Both tables carry a stored generated ``search_vector`` column with a GIN
+index (migration c8d9e0f1a2b3).  Queries go through ``websearch_to_tsquery``,
+so user input such as ``"exact phrase" -word or other`` is accepted as typed
+and never raises a syntax error.
+"""
+from sqlalchemy import func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration of the generated columns; queries must use the same one.
+SEARCH_CONFIG = "english"
+
+# Titles weigh more than descriptions in the ranking.
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
+_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def to_query(text: str) -> ColumnElement:
+    return func.websearch_to_tsquery(_REGCONFIG, text)
+
+
+def rank(vector, query) -> ColumnElement:
+    # Cover density, normalized by document length (flag 1: 1 + log(length))
+    return func.ts_rank_cd(vector, query, 1)
@@ -1,10 +1,42 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE_LIMIT,
+    PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes verify_and_update flag
+# any hash created with a different cost for rehashing.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread pool keeps the event loop responsive.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_in_flight = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool and its queue are both full."""
+
+    def __init__(self, retry_after: int = PASSWORD_HASH_RETRY_AFTER_SECONDS):
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,8 +47,60 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+async def _run_hasher(fn, *args):
+    global _hash_in_flight
+    if _hash_in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+        raise PasswordHasherBusy()
+    _hash_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_in_flight -= 1
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify off the event loop.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash
+    used a different cost and should be replaced.
+    """
+    return await _run_hasher(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    """Hash off the event loop."""
+    return await _run_hasher(pwd_context.hash, password)
+
+
+def shutdown_password_hasher() -> None:
+    _hash_executor.shutdown(wait=True, cancel_futures=True)
+
+
+def create_access_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    *,
+    role_id: Optional[str] = None,
+    role_name: Optional[str] = None,
+    permissions_mask: Optional[int] = None,
+    permissions_version: Optional[int] = None,
+) -> str:
+    """Encode a JWT for ``data``.
+
+    When ``permissions_mask`` is given the token is a stateless one: it also
+    carries the role (``rid``/``rn``), the permissions bitmask (``pm``) and the
+    role's permissions version (``pv``) it was computed at.
+    """
     to_encode = data.copy()
+    if permissions_mask is not None:
+        to_encode.update({
+            "rid": role_id,
+            "rn": role_name,
+            "pm": permissions_mask,
+            "pv": permissions_version,
+        })
     expire = datetime.now(timezone.utc) + (
         expires_delta if expires_delta else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
@@ -0,0 +1,13 @@
+"""Gunicorn worker for production; see gunicorn.conf.py."""
+from uvicorn_worker import UvicornWorker
+
+
+class Worker(UvicornWorker):
+    """uvicorn worker pinned to uvloop and httptools.
+
+    The "auto" defaults fall back to asyncio and h11 without a word when the
+    extras are missing; naming them makes a broken install fail at boot.
+    Keep-alive, backlog and graceful timeout come from the gunicorn settings.
+    """
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": "uvloop", "http": "httptools"}
@@ -0,0 +1,73 @@
+"""Startup warm-up, so the first requests after a cold start do not pay for it.
+
+Opens DB_WARMUP_CONNECTIONS pooled connections to the primary at once (TCP,
+TLS and the asyncpg handshake), runs the statements behind authentication
+and the sprint board on each of them, and compiles every role.  The runs
+fill SQLAlchemy's compiled statement cache, and prepare each statement in
+that connection's asyncpg cache.  The ids are random, so nothing is read.
+"""
+import asyncio
+import logging
+import time
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app.core.config import DB_POOL_SIZE, DB_WARMUP_CONNECTIONS, DB_WARMUP_TIMEOUT_SECONDS
+from app.core.database import AsyncSessionLocal, engine
+from app.core.permissions import role_registry
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _hot_statements():
+    # Same shapes as the routes build, so they share compiled cache entries
+    user_id, sprint_id = uuid4(), uuid4()
+    story_ids = select(UserStory.id).where(UserStory.sprint_id == sprint_id)
+    return [
+        select(User).where(User.id == user_id),
+        select(Sprint).where(Sprint.id == sprint_id),
+        select(UserStory).where(UserStory.sprint_id == sprint_id).order_by(UserStory.user_story_no),
+        select(Task).where(Task.user_story_id.in_(story_ids)).order_by(Task.task_no),
+    ]
+
+
+async def _warm_connections(count: int) -> None:
+    connections = [engine.connect() for _ in range(count)]
+    try:
+        await asyncio.gather(*(conn.start() for conn in connections))
+
+        async def run(conn):
+            for stmt in _hot_statements():
+                (await conn.execute(stmt)).all()
+            await conn.rollback()
+
+        await asyncio.gather(*(run(conn) for conn in connections))
+    finally:
+        # Back to the pool, still open
+        await asyncio.gather(*(conn.close() for conn in connections), return_exceptions=True)
+
+
+async def _prime_roles() -> None:
+    async with AsyncSessionLocal() as session:
+        await role_registry.prime(session)
+
+
+async def warm_up() -> None:
+    """Warm the pool and caches; never fails startup, a cold first request is the fallback."""
+    count = min(DB_WARMUP_CONNECTIONS, DB_POOL_SIZE)
+    if count <= 0:
+        return
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(_warm_connections(count), _prime_roles()), DB_WARMUP_TIMEOUT_SECONDS
+        )
+    except Exception as exc:
+        logger.warning("Warm-up skipped after %.1fs: %r", time.perf_counter() - started, exc)
+        return
+    logger.info("Warmed %d connection(s) and the role registry in %.0f ms", count, (time.perf_counter() - started) * 1000)
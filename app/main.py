@@ -1,17 +1,69 @@
-from fastapi import FastAPI
+import logging
+import secrets
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.routers import project, sprint, user, task, user_story
-from app.routers import auth
+from app.routers import analytics, auth, board, export, search
 from app.routers import role as role_router
-from app.models import user as user_model
-from app.models import project as project_model
-from app.models import sprint as sprint_model
-from app.models import task as task_model
-from app.models import user_story as user_story_model
-from app.models import role as role_model
-from app.core.config import CORS_ORIGINS
+from app.core.config import CORS_ORIGINS, DB_DIAGNOSTICS, METRICS_ENABLED, METRICS_TOKEN
+from app.core.cache import cache_stats
+from app.core.database import describe_engine, engine, recent_writers, replicas
+from app.core.dependencies import get_current_user
+from app.core.diagnostics import DiagnosticsMiddleware
+from app.core.pagination import PAGINATION_HEADERS
+from app.core.google_auth import close_http_client
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.response_cache import response_cache
+from app.core.security import PasswordHasherBusy, shutdown_password_hasher
+from app.core.serialization import ORJSONResponse
+from app.core.warmup import warm_up
 
-app = FastAPI(title="Plannr Backend API", version="1.0.0")
+
+# uvicorn's logger is the one that is configured to print under uvicorn and gunicorn
+logger = logging.getLogger("uvicorn.error")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  logger.info("Database: %s", describe_engine())
+  replicas.start()
+  await warm_up()
+  yield
+  # Runs after the server stopped accepting and in-flight requests finished
+  # (gunicorn's graceful_timeout), so closing the pool drops no work.
+  await replicas.close()
+  await recent_writers.close()
+  await engine.dispose()
+  await close_http_client()
+  await response_cache.close()
+  shutdown_password_hasher()
+
+# Bodies that still go through response_model validation are encoded with orjson
+app = FastAPI(
+  title="Plannr Backend API",
+  version="1.0.0",
+  lifespan=lifespan,
+  default_response_class=ORJSONResponse,
+)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+  return JSONResponse(
+    status_code=503,
+    content={"detail": "Authentication is busy, please retry shortly"},
+    headers={"Retry-After": str(exc.retry_after)},
+  )
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+  # Every pooled connection stayed busy for DB_POOL_TIMEOUT seconds
+  return JSONResponse(
+    status_code=503,
+    content={"detail": "Database is busy, please retry shortly"},
+    headers={"Retry-After": "1"},
+  )
 
 # Configure CORS
 # NOTE: allow_origins cannot be ["*"] when allow_credentials=True —
@@ -23,7 +75,13 @@ app.add_middleware(
     allow_credentials=_allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS,
 )
+if DB_DIAGNOSTICS:
+  app.add_middleware(DiagnosticsMiddleware)
+# Outermost, so the latency includes every other middleware
+if METRICS_ENABLED:
+  app.add_middleware(MetricsMiddleware, skip=["/metrics"])
 
 app.include_router(auth.router)
 app.include_router(project.router)
@@ -32,7 +90,27 @@ app.include_router(user.router)
 app.include_router(task.router)
 app.include_router(user_story.router)
 app.include_router(role_router.router)
+app.include_router(board.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
+app.include_router(search.router)
 
 @app.get("/")
 def root():
-  return {"message": "Welcome to the Plannr Backend API"}
\ No newline at end of file
+  return {"message": "Welcome to the Plannr Backend API"}
+
+@app.get("/stats/cache", dependencies=[Depends(get_current_user)])
+def get_cache_stats():
+  """Hit/miss counters for the in-process caches of this worker."""
+  return cache_stats()
+
+if METRICS_ENABLED:
+  # async: rendering must not race the event loop that updates the counters
+  @app.get("/metrics", include_in_schema=False)
+  async def get_metrics(request: Request):
+    """Prometheus scrape endpoint for this worker."""
+    if METRICS_TOKEN:
+      scheme, _, token = request.headers.get("authorization", "").partition(" ")
+      if scheme.lower() != "bearer" or not secrets.compare_digest(token, METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
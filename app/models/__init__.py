@@ -8,3 +8,4 @@ from app.models.project import Project  # noqa: F401
 from app.models.sprint import Sprint  # noqa: F401
 from app.models.user_story import UserStory  # noqa: F401
 from app.models.task import Task  # noqa: F401
+from app.models.sprint_stat import SprintDailyStat  # noqa: F401
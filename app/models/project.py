@@ -1,16 +1,23 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP, Text, func
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, TIMESTAMP, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
 class Project(Base):
   __tablename__ = "projects"
-  __table_args__ = {"schema": "boards"}
+  __table_args__ = (
+    Index("ix_projects_created_by", "created_by"),
+    Index("ix_projects_created_at_id", "created_at", "id"),
+    {"schema": "boards"},
+  )
 
   id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
   name: Mapped[str] = mapped_column(String(150))
   description: Mapped[str | None] = mapped_column(Text)
   created_by: Mapped[str] = mapped_column(UUID(as_uuid=True), ForeignKey("boards.users.id"))
-  created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
\ No newline at end of file
+  created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+  updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+  # Highest sprint_number handed out so far; bumped atomically by create_sprint
+  last_sprint_number: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
\ No newline at end of file
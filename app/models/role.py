@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 from typing import TYPE_CHECKING
-from sqlalchemy import String, TIMESTAMP, Boolean, Text, func
+from sqlalchemy import Integer, String, TIMESTAMP, Boolean, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
@@ -26,6 +26,10 @@ class Role(Base):
     modified_at: Mapped[datetime] = mapped_column(
         TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    # Bumped whenever the role's grants change; stateless tokens carry a copy
+    permissions_version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
 
     # Reverse relationship to users
     users: Mapped[list] = relationship("User", back_populates="role_info", lazy="select")
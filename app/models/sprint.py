@@ -1,13 +1,17 @@
 from datetime import datetime, date
 from uuid import uuid4
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, Date, func
+from sqlalchemy import Index, Integer, String, ForeignKey, TIMESTAMP, Date, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
 class Sprint(Base):
   __tablename__ = "sprints"
-  __table_args__ = {"schema": "boards"}
+  __table_args__ = (
+    Index("ix_sprints_project_id_status", "project_id", "status"),
+    Index("ix_sprints_created_at_id", "created_at", "id"),
+    {"schema": "boards"},
+  )
 
   id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
   name: Mapped[str] = mapped_column(String(150))
@@ -16,4 +20,5 @@ class Sprint(Base):
   end_date: Mapped[date | None] = mapped_column(Date)
   status: Mapped[str] = mapped_column(String(50))
   sprint_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
-  created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
\ No newline at end of file
+  created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
+  updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
@@ -0,0 +1,26 @@
+from datetime import date
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class SprintDailyStat(Base):
+  """Net change, on one day, of the tasks or stories of a sprint in one status.
+
+  Maintained by database triggers on tasks and user_stories (see migration
+  b7c8d9e0f1a2); the state of a sprint on day D is the sum of its rows with
+  ``day <= D``.  Never written by the application.
+  """
+  __tablename__ = "sprint_daily_stats"
+  __table_args__ = {"schema": "boards"}
+
+  sprint_id: Mapped[str] = mapped_column(
+    UUID(as_uuid=True), ForeignKey("boards.sprints.id", ondelete="CASCADE"), primary_key=True
+  )
+  day: Mapped[date] = mapped_column(Date, primary_key=True)
+  # "task" or "story"
+  kind: Mapped[str] = mapped_column(String(10), primary_key=True)
+  status: Mapped[str] = mapped_column(String(30), primary_key=True)
+  items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+  # Sum of estimated_hours; always 0 for stories
+  hours: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 from typing import Optional
-from sqlalchemy import String, TIMESTAMP, ForeignKey, func, Text
+from sqlalchemy import Index, String, TIMESTAMP, ForeignKey, func, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
@@ -9,7 +9,12 @@ from app.core.database import Base
 
 class User(Base):
     __tablename__ = "users"
-    __table_args__ = {"schema": "boards"}
+    __table_args__ = (
+        Index("ix_users_role_id", "role_id"),
+        Index("ix_users_last_modified_by", "last_modified_by"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+        {"schema": "boards"},
+    )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String)
@@ -32,7 +37,7 @@ class User(Base):
     google_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, unique=True)
     avatar_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     auth_provider: Mapped[str] = mapped_column(String(50), default="local")
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), nullable=False)
 
     # Relationships
     role_info: Mapped[Optional["Role"]] = relationship(  # type: ignore[name-defined]
@@ -1,13 +1,19 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, Integer, String, ForeignKey, TIMESTAMP, Text, func, Identity
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, Index, Integer, String, ForeignKey, TIMESTAMP, Text, func, Identity
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
+from app.core.search import SEARCH_VECTOR
 
 class UserStory(Base):
   __tablename__ = "user_stories"
-  __table_args__ = {"schema": "boards"}
+  __table_args__ = (
+    Index("ix_user_stories_sprint_id_status", "sprint_id", "status"),
+    Index("ix_user_stories_assignee_id", "assignee_id"),
+    Index("ix_user_stories_search_vector", "search_vector", postgresql_using="gin"),
+    {"schema": "boards"},
+  )
 
   id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
   user_story_no: Mapped[int] = mapped_column(Integer, Identity(start=10000001, cycle=False), unique=True, nullable=False)
@@ -17,4 +23,9 @@ class UserStory(Base):
   status: Mapped[str] = mapped_column(String(30))
   priority: Mapped[int | None] = mapped_column(Integer, nullable=True)
   created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
-  assignee_id: Mapped[str | None] = mapped_column(UUID(as_uuid=True), ForeignKey("boards.users.id"), nullable=True)
\ No newline at end of file
+  updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+  assignee_id: Mapped[str | None] = mapped_column(UUID(as_uuid=True), ForeignKey("boards.users.id"), nullable=True)
+  # Generated by the database and only read by search queries (through
+  # __table__.c); left unmapped so inserts and updates never fetch it back.
+  search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True))
+  __mapper_args__ = {"exclude_properties": ["search_vector"]}
@@ -0,0 +1,191 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
+from uuid import UUID
+from app.core.config import ANALYTICS_DONE_STATUSES, VELOCITY_DEFAULT_SPRINTS, VELOCITY_MAX_SPRINTS
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.sprint_stat import SprintDailyStat
+from app.schemas.analytics import BurndownOut, VelocityOut, WorkSummaryOut
+
+# Served from boards.sprint_daily_stats, which triggers keep up to date as
+# tasks and stories change: a handful of rows per sprint and day, never a
+# scan of the tasks themselves.
+
+router = APIRouter(
+  prefix="/analytics",
+  tags=["analytics"],
+  dependencies=[Depends(get_current_user)],
+)
+
+_stat = SprintDailyStat
+_is_task = _stat.kind == "task"
+_is_story = _stat.kind == "story"
+_is_done = _stat.status.in_(ANALYTICS_DONE_STATUSES)
+
+def _total(column, *conditions):
+  return func.coalesce(func.sum(column).filter(and_(*conditions)), 0)
+
+# Column order matches the fields of BurndownPoint after "day"
+_BURNDOWN_SUMS = (
+  _total(_stat.hours, _is_task),
+  _total(_stat.hours, _is_task, _is_done),
+  _total(_stat.items, _is_task),
+  _total(_stat.items, _is_task, _is_done),
+  _total(_stat.items, _is_story),
+  _total(_stat.items, _is_story, _is_done),
+)
+
+def _summarize(rows) -> dict:
+  """Build a WorkSummaryOut payload from (kind, status, items, hours) totals."""
+  tasks, stories = [], []
+  total_hours = done_hours = 0
+  for kind, status, items, hours in rows:
+    if not items and not hours:
+      continue
+    if kind == "task":
+      tasks.append({"status": status, "count": items, "hours": hours})
+      total_hours += hours
+      if status in ANALYTICS_DONE_STATUSES:
+        done_hours += hours
+    else:
+      stories.append({"status": status, "count": items})
+  return {
+    "tasks_by_status": tasks,
+    "stories_by_status": stories,
+    "total_hours": total_hours,
+    "remaining_hours": total_hours - done_hours,
+  }
+
+async def _summary(db: AsyncSession, *criteria) -> dict:
+  result = await db.execute(
+    select(_stat.kind, _stat.status, func.sum(_stat.items), func.sum(_stat.hours))
+    .where(*criteria)
+    .group_by(_stat.kind, _stat.status)
+    .order_by(_stat.kind, _stat.status)
+  )
+  return _summarize(result.all())
+
+# current task hours and task/story counts by status for one sprint
+@router.get("/sprint/{sprint_id}/summary", response_model=WorkSummaryOut)
+async def get_sprint_summary(sprint_id: UUID, db: AsyncSession = Depends(get_db)):
+  summary = await _summary(db, _stat.sprint_id == sprint_id)
+  if not summary["tasks_by_status"] and not summary["stories_by_status"]:
+    exists = await db.execute(select(Sprint.id).where(Sprint.id == sprint_id))
+    if not exists.first():
+      raise HTTPException(status_code=404, detail="Sprint not found")
+  return summary
+
+# the same across every sprint of a project
+@router.get("/project/{project_id}/summary", response_model=WorkSummaryOut)
+async def get_project_summary(project_id: UUID, db: AsyncSession = Depends(get_db)):
+  sprint_ids = select(Sprint.id).where(Sprint.project_id == project_id)
+  summary = await _summary(db, _stat.sprint_id.in_(sprint_ids))
+  if not summary["tasks_by_status"] and not summary["stories_by_status"]:
+    exists = await db.execute(select(Project.id).where(Project.id == project_id))
+    if not exists.first():
+      raise HTTPException(status_code=404, detail="Project not found")
+  return summary
+
+# remaining hours and done counts at the end of each day of a sprint (2 queries)
+@router.get("/sprint/{sprint_id}/burndown", response_model=BurndownOut)
+async def get_sprint_burndown(sprint_id: UUID, db: AsyncSession = Depends(get_db)):
+  result = await db.execute(select(Sprint.start_date, Sprint.end_date).where(Sprint.id == sprint_id))
+  sprint = result.one_or_none()
+  if sprint is None:
+    raise HTTPException(status_code=404, detail="Sprint not found")
+
+  result = await db.execute(
+    select(_stat.day, *_BURNDOWN_SUMS)
+    .where(_stat.sprint_id == sprint_id)
+    .group_by(_stat.day)
+    .order_by(_stat.day)
+  )
+  changes = result.all()
+
+  # Days run from the sprint's start (or its first change) up to its end or
+  # today, whichever comes first; changes outside that range still count
+  # towards the state at its edges.
+  first = sprint.start_date or (changes[0].day if changes else None)
+  last = min(sprint.end_date or date.today(), date.today())
+  days = []
+  running = [0] * len(_BURNDOWN_SUMS)
+  pending = iter(changes)
+  change = next(pending, None)
+  day = first
+  while day is not None and day <= last:
+    while change is not None and change.day <= day:
+      running = [total + delta for total, delta in zip(running, change[1:])]
+      change = next(pending, None)
+    total_hours, done_hours, tasks_total, tasks_done, stories_total, stories_done = running
+    days.append({
+      "day": day,
+      "total_hours": total_hours,
+      "remaining_hours": total_hours - done_hours,
+      "tasks_total": tasks_total,
+      "tasks_done": tasks_done,
+      "stories_total": stories_total,
+      "stories_done": stories_done,
+    })
+    day += timedelta(days=1)
+
+  return {"sprint_id": sprint_id, "start_date": sprint.start_date, "end_date": sprint.end_date, "days": days}
+
+# completed hours, tasks and stories of the project's last N sprints (1 query)
+@router.get("/project/{project_id}/velocity", response_model=VelocityOut)
+async def get_project_velocity(
+  project_id: UUID,
+  sprints: int = Query(VELOCITY_DEFAULT_SPRINTS, ge=1, le=VELOCITY_MAX_SPRINTS, description="How many recent sprints"),
+  db: AsyncSession = Depends(get_db),
+):
+  newest_first = (Sprint.sprint_number.desc().nulls_last(), Sprint.created_at.desc())
+  recent = (
+    select(Sprint.id, Sprint.name, Sprint.sprint_number, Sprint.status, Sprint.start_date, Sprint.end_date, Sprint.created_at)
+    .where(Sprint.project_id == project_id)
+    .order_by(*newest_first)
+    .limit(sprints)
+    .subquery()
+  )
+  result = await db.execute(
+    select(
+      recent.c.id,
+      recent.c.name,
+      recent.c.sprint_number,
+      recent.c.status,
+      recent.c.start_date,
+      recent.c.end_date,
+      _total(_stat.hours, _is_task),
+      _total(_stat.hours, _is_task, _is_done),
+      _total(_stat.items, _is_task, _is_done),
+      _total(_stat.items, _is_story, _is_done),
+    )
+    .outerjoin(_stat, _stat.sprint_id == recent.c.id)
+    .group_by(*recent.c)
+    .order_by(recent.c.sprint_number.nulls_first(), recent.c.created_at)
+  )
+  rows = result.all()
+  if not rows:
+    exists = await db.execute(select(Project.id).where(Project.id == project_id))
+    if not exists.first():
+      raise HTTPException(status_code=404, detail="Project not found")
+
+  velocity = [
+    {
+      "sprint_id": row[0],
+      "name": row[1],
+      "sprint_number": row[2],
+      "status": row[3],
+      "start_date": row[4],
+      "end_date": row[5],
+      "committed_hours": row[6],
+      "completed_hours": row[7],
+      "completed_tasks": row[8],
+      "completed_stories": row[9],
+    }
+    for row in rows
+  ]
+  average = sum(v["completed_hours"] for v in velocity) / len(velocity) if velocity else 0.0
+  return {"project_id": project_id, "sprints": velocity, "average_completed_hours": round(average, 2)}
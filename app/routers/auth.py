@@ -1,51 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import uuid4
-import httpx
+from typing import Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, recent_writers
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_and_update_password,
+    hash_password,
     create_access_token,
 )
-from app.core.config import GOOGLE_CLIENT_ID
-from app.core.dependencies import get_current_user
-from app.core.permissions import build_permissions_map
+from app.core.config import STATELESS_AUTH
+from app.core.google_auth import GoogleTokenError, verify_google_id_token
+from app.core.dependencies import TokenPrincipal, get_current_user, get_token_principal, invalidate_principal
+from app.core.etag import conditional
+from app.core.permissions import CompiledRole, mask_to_permissions_map, role_registry
 from app.models.user import User
 from app.models.role import Role
-from app.models.role_permission import RolePermission
 from app.schemas.auth import RegisterRequest, LoginRequest, GoogleAuthRequest, AuthResponse
-from app.schemas.user import UserOut
+from app.schemas.user import UserOut, user_payload
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Reusable selectinload chain for deep-loading role → role_permissions → permission
-_ROLE_PERMISSIONS_LOAD = (
-    selectinload(User.role_info)
-    .selectinload(Role.role_permissions)
-    .selectinload(RolePermission.permission)
-)
+def _issue_token(user: User, role: Optional[CompiledRole]) -> str:
+    """Create an access token; in STATELESS_AUTH mode it embeds the role's grants."""
+    if not STATELESS_AUTH:
+        return create_access_token({"sub": str(user.id)})
+
+    return create_access_token(
+        {"sub": str(user.id)},
+        role_id=role.id if role else None,
+        role_name=role.name if role else None,
+        permissions_mask=role.mask if role else 0,
+        permissions_version=role.version if role else None,
+    )
 
 
-def _user_to_out(user: User) -> UserOut:
-    """Build a UserOut from an ORM User with role_info + permissions eagerly loaded."""
-    return UserOut(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        role_id=user.role_id,
-        role_name=user.role_info.role_name if user.role_info else None,
-        status=user.status,
-        last_modified_on=user.last_modified_on,
-        last_modified_by=user.last_modified_by,
-        avatar_url=user.avatar_url,
-        auth_provider=user.auth_provider,
-        created_at=user.created_at,
-        permissions=build_permissions_map(user),
-    )
+async def _auth_response(user: User, db: AsyncSession) -> AuthResponse:
+    role = await role_registry.get(db, user.role_id)
+    return AuthResponse(access_token=_issue_token(user, role), user=user_payload(user, role))
 
 
 # ─── Endpoints ──────────────────────────────────────────────────────────────
@@ -67,19 +60,17 @@ async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
         id=uuid4(),
         name=data.name,
         email=data.email,
-        password_hash=get_password_hash(data.password),
+        password_hash=await hash_password(data.password),
         auth_provider="local",
         role_id=data.role_id,
     )
     db.add(user)
     await db.commit()
-
-    result2 = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user.id)
-    )
-    user = result2.scalar_one()
-    token = create_access_token({"sub": str(user.id)})
-    return AuthResponse(access_token=token, user=_user_to_out(user))
+    # The new account is not on the replicas yet
+    await recent_writers.mark(user.id)
+    # Load server defaults and normalise the role_id assigned in-session
+    await db.refresh(user)
+    return await _auth_response(user, db)
 
 
 @router.post("/login", response_model=AuthResponse)
@@ -91,15 +82,19 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user or not user.password_hash:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    if not verify_password(data.password, user.password_hash):
+    valid, new_hash = await verify_and_update_password(data.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    result2 = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user.id)
-    )
-    user = result2.scalar_one()
-    token = create_access_token({"sub": str(user.id)})
-    return AuthResponse(access_token=token, user=_user_to_out(user))
+    if new_hash:
+        # Stored hash used a different bcrypt cost; upgrade it while we have the password
+        user.password_hash = new_hash
+        await db.commit()
+        # last_modified_on was set by the database (onupdate) and is expired
+        await db.refresh(user)
+        invalidate_principal(user.id)
+
+    return await _auth_response(user, db)
 
 
 @router.post("/google", response_model=AuthResponse)
@@ -108,22 +103,11 @@ async def google_auth(data: GoogleAuthRequest, db: AsyncSession = Depends(get_db
     Verify a Google ID token from the frontend (@react-oauth/google) and
     sign in or create the user automatically.
     """
-    # Verify the Google ID token via Google's tokeninfo endpoint
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://oauth2.googleapis.com/tokeninfo",
-            params={"id_token": data.credential},
-            timeout=10.0,
-        )
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Invalid Google token")
-
-    google_data = response.json()
-
-    # Validate that the token was issued for our app
-    if GOOGLE_CLIENT_ID and google_data.get("aud") != GOOGLE_CLIENT_ID:
-        raise HTTPException(status_code=401, detail="Google token audience mismatch")
+    # Verify the Google ID token locally against Google's cached signing keys
+    try:
+        google_data = await verify_google_id_token(data.credential)
+    except GoogleTokenError as exc:
+        raise HTTPException(status_code=401, detail=str(exc))
 
     google_id: str = google_data.get("sub")
     email: str = google_data.get("email", "")
@@ -146,6 +130,7 @@ async def google_auth(data: GoogleAuthRequest, db: AsyncSession = Depends(get_db
             user.google_id = google_id
             user.avatar_url = avatar_url or user.avatar_url
             user.auth_provider = "google"
+            invalidate_principal(user.id)
         else:
             # Create brand-new user
             user = User(
@@ -159,23 +144,35 @@ async def google_auth(data: GoogleAuthRequest, db: AsyncSession = Depends(get_db
             db.add(user)
 
     await db.commit()
-
-    result2 = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user.id)
-    )
-    user = result2.scalar_one()
-    token = create_access_token({"sub": str(user.id)})
-    return AuthResponse(access_token=token, user=_user_to_out(user))
+    await recent_writers.mark(user.id)
+    await db.refresh(user)
+    return await _auth_response(user, db)
 
 
 @router.get("/me", response_model=UserOut)
 async def get_me(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
+    principal: TokenPrincipal = Depends(get_token_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    """Return the currently authenticated user."""
-    result = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == current_user.id)
+    """Return the currently authenticated user.
+
+    The role name and grants are the principal's: with STATELESS_AUTH they
+    come from the token, so only the (cached) users row is read.
+    """
+    role_id = str(current_user.role_id) if current_user.role_id else None
+    role_name, mask = principal.role_name, principal.permissions_mask
+    if principal.role_id != role_id:
+        # The user's role changed after this stateless token was issued
+        role = await role_registry.get(db, role_id)
+        role_name, mask = (role.name, role.mask) if role else (None, 0)
+    not_modified = conditional(
+        request, response, current_user.id, current_user.last_modified_on, role_id, role_name, mask,
     )
-    user = result.scalar_one()
-    return _user_to_out(user)
+    if not_modified:
+        return not_modified
+    payload = user_payload(current_user, None)
+    payload["role_name"], payload["permissions"] = role_name, mask_to_permissions_map(mask)
+    return payload
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select
+from uuid import UUID
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.serialization import Serializer, respond
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user_story import UserStory
+from app.schemas.board import ProjectBoardOut, SprintBoardOut
+from app.schemas.user_story import UserStoryOut
+
+# Boards are assembled from a fixed number of set-based queries (one per
+# level), never one query per story, whatever the size of the board.
+
+router = APIRouter(
+  prefix="/board",
+  tags=["board"],
+  dependencies=[Depends(get_current_user)],
+)
+
+_STORY_FIELDS = tuple(UserStoryOut.model_fields)
+
+# Boards are the largest bodies we send: encoded straight from the loaded rows
+_SPRINT_BOARD = Serializer(SprintBoardOut)
+_PROJECT_BOARD = Serializer(ProjectBoardOut)
+
+def _filter_stories(stmt: Select, story_status: str | None) -> Select:
+  if story_status is not None:
+    stmt = stmt.where(UserStory.status == story_status)
+  return stmt
+
+def _filter_tasks(stmt: Select, status: str | None, assignee_id: UUID | None) -> Select:
+  if status is not None:
+    stmt = stmt.where(Task.status == status)
+  if assignee_id is not None:
+    stmt = stmt.where(Task.assignee_id == assignee_id)
+  return stmt
+
+def _assemble(stories, tasks) -> dict:
+  """Group stories (with their tasks nested) by sprint id."""
+  tasks_by_story = defaultdict(list)
+  for task in tasks:
+    tasks_by_story[task.user_story_id].append(task)
+  stories_by_sprint = defaultdict(list)
+  for story in stories:
+    payload = {field: getattr(story, field) for field in _STORY_FIELDS}
+    payload["tasks"] = tasks_by_story.get(story.id, [])
+    stories_by_sprint[story.sprint_id].append(payload)
+  return stories_by_sprint
+
+# get one sprint's stories with their tasks embedded (3 queries)
+@router.get("/sprint/{sprint_id}", response_model=SprintBoardOut)
+async def get_sprint_board(
+  sprint_id: UUID,
+  status: str | None = Query(None, description="Only tasks in this status"),
+  assignee_id: UUID | None = Query(None, description="Only tasks assigned to this user"),
+  story_status: str | None = Query(None, description="Only stories in this status"),
+  db: AsyncSession = Depends(get_db),
+):
+  result = await db.execute(select(Sprint).where(Sprint.id == sprint_id))
+  sprint = result.scalar_one_or_none()
+  if not sprint:
+    raise HTTPException(status_code=404, detail="Sprint not found")
+
+  story_stmt = _filter_stories(select(UserStory).where(UserStory.sprint_id == sprint_id), story_status)
+  stories = (await db.execute(story_stmt.order_by(UserStory.user_story_no))).scalars().all()
+
+  story_ids = _filter_stories(select(UserStory.id).where(UserStory.sprint_id == sprint_id), story_status)
+  task_stmt = _filter_tasks(select(Task).where(Task.user_story_id.in_(story_ids)), status, assignee_id)
+  tasks = (await db.execute(task_stmt.order_by(Task.task_no))).scalars().all()
+
+  board = {"sprint": sprint, "stories": _assemble(stories, tasks).get(sprint.id, [])}
+  return respond(_SPRINT_BOARD.dump_json(board))
+
+# get every sprint of a project with stories and tasks embedded (4 queries)
+@router.get("/project/{project_id}", response_model=ProjectBoardOut)
+async def get_project_board(
+  project_id: UUID,
+  status: str | None = Query(None, description="Only tasks in this status"),
+  assignee_id: UUID | None = Query(None, description="Only tasks assigned to this user"),
+  story_status: str | None = Query(None, description="Only stories in this status"),
+  sprint_status: str | None = Query(None, description="Only sprints in this status"),
+  db: AsyncSession = Depends(get_db),
+):
+  result = await db.execute(select(Project).where(Project.id == project_id))
+  project = result.scalar_one_or_none()
+  if not project:
+    raise HTTPException(status_code=404, detail="Project not found")
+
+  sprint_ids = select(Sprint.id).where(Sprint.project_id == project_id)
+  sprint_stmt = select(Sprint).where(Sprint.project_id == project_id)
+  if sprint_status is not None:
+    sprint_ids = sprint_ids.where(Sprint.status == sprint_status)
+    sprint_stmt = sprint_stmt.where(Sprint.status == sprint_status)
+  sprints = (await db.execute(sprint_stmt.order_by(Sprint.created_at, Sprint.id))).scalars().all()
+
+  story_stmt = _filter_stories(select(UserStory).where(UserStory.sprint_id.in_(sprint_ids)), story_status)
+  stories = (await db.execute(story_stmt.order_by(UserStory.user_story_no))).scalars().all()
+
+  story_ids = _filter_stories(select(UserStory.id).where(UserStory.sprint_id.in_(sprint_ids)), story_status)
+  task_stmt = _filter_tasks(select(Task).where(Task.user_story_id.in_(story_ids)), status, assignee_id)
+  tasks = (await db.execute(task_stmt.order_by(Task.task_no))).scalars().all()
+
+  stories_by_sprint = _assemble(stories, tasks)
+  board = {
+    "project": project,
+    "sprints": [{"sprint": s, "stories": stories_by_sprint.get(s.id, [])} for s in sprints],
+  }
+  return respond(_PROJECT_BOARD.dump_json(board))
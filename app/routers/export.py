@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from enum import Enum
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.core.database import get_db, session_factory
+from app.core.dependencies import bearer_scheme, get_current_user
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+from app.schemas.sprint import SprintOut
+from app.schemas.task import TaskOut
+from app.schemas.user_story import UserStoryOut
+
+
+async def _current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db, scope="function"),
+) -> User:
+    # get_current_user on a function-scoped session: it is closed when the
+    # endpoint returns, so only the stream's own connection stays checked out.
+    return await get_current_user(credentials, db)
+
+
+router = APIRouter(
+    prefix="/export",
+    tags=["export"],
+    dependencies=[Depends(_current_user)],
+)
+
+
+class ExportEntity(str, Enum):
+    sprints = "sprints"
+    user_stories = "user-stories"
+    tasks = "tasks"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _export_query(entity: ExportEntity, project_id: UUID) -> tuple[Select, type[BaseModel]]:
+    if entity is ExportEntity.sprints:
+        stmt = (
+            select(Sprint)
+            .where(Sprint.project_id == project_id)
+            .order_by(Sprint.created_at, Sprint.id)
+        )
+        return stmt, SprintOut
+    if entity is ExportEntity.user_stories:
+        stmt = (
+            select(UserStory)
+            .join(Sprint, UserStory.sprint_id == Sprint.id)
+            .where(Sprint.project_id == project_id)
+            .order_by(UserStory.user_story_no)
+        )
+        return stmt, UserStoryOut
+    stmt = (
+        select(Task)
+        .join(UserStory, Task.user_story_id == UserStory.id)
+        .join(Sprint, UserStory.sprint_id == Sprint.id)
+        .where(Sprint.project_id == project_id)
+        .order_by(Task.task_no)
+    )
+    return stmt, TaskOut
+
+
+async def _stream_rows(request: Request, stmt: Select, schema: type[BaseModel], fmt: ExportFormat):
+    """Yield one encoded chunk per server-side cursor batch.
+
+    The session is opened here rather than taken from get_db so the pooled
+    connection lives exactly as long as the stream, and is handed back as
+    soon as the client goes away.  Like get_db it reads from a replica when
+    one is available.
+    """
+    fields = list(schema.model_fields)
+    async with (await session_factory(request))() as session:
+        result = await session.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            if fmt is ExportFormat.csv:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(fields)
+                yield buffer.getvalue()
+
+            async for batch in result.partitions():
+                if await request.is_disconnected():
+                    break
+                rows = [schema.model_validate(obj).model_dump(mode="json") for obj in batch]
+                if fmt is ExportFormat.ndjson:
+                    yield "".join(json.dumps(row) + "\n" for row in rows)
+                else:
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerows([["" if row[f] is None else row[f] for f in fields] for row in rows])
+                    yield buffer.getvalue()
+        finally:
+            await result.close()
+
+
+@router.get("/project/{project_id}/{entity}")
+async def export_project(
+    project_id: UUID,
+    entity: ExportEntity,
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    """Stream every sprint, user story or task of a project as NDJSON or CSV."""
+    result = await db.execute(select(Project.id).where(Project.id == project_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    stmt, schema = _export_query(entity, project_id)
+    filename = f"{project_id}-{entity.value}.{format.value}"
+    return StreamingResponse(
+        _stream_rows(request, stmt, schema, format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
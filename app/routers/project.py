@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import row_conditional
+from app.core.pagination import Pagination
+from app.core.response_cache import response_cache
+from app.core.serialization import Serializer
 from app.models.project import Project
 from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectOut
@@ -13,6 +17,9 @@ router = APIRouter(
   dependencies=[Depends(get_current_user)],
 )
 
+_PROJECT = Serializer(ProjectOut)
+_PROJECTS = Serializer(ProjectOut, many=True)
+
 @router.post("/", response_model=ProjectOut)
 async def create_project(
   data: ProjectCreate,
@@ -23,21 +30,35 @@ async def create_project(
   db.add(project)
   await db.commit()
   await db.refresh(project)
+  await response_cache.invalidate("projects:all")
   return project
 
 @router.get("/", response_model=list[ProjectOut])
-async def get_projects(db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Project))
-  projects = result.scalars().all()
-  return projects
+async def get_projects(page: Pagination = Depends(), db: AsyncSession = Depends(get_db)):
+  cached, key = await response_cache.lookup(page.request, ("projects:all",), db)
+  if cached:
+    return cached
+  projects = await page.fetch(db, select(Project), (Project.created_at, Project.id))
+  return await response_cache.store(key, page.response, _PROJECTS, projects)
 
 @router.get("/{project_id}", response_model=ProjectOut)
-async def get_project(project_id: str, db: AsyncSession = Depends(get_db)):
+async def get_project(
+  project_id: str,
+  request: Request,
+  response: Response,
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(request, (f"project:{project_id}",), db)
+  if cached:
+    return cached
+  not_modified = await row_conditional(request, response, db, Project.updated_at, Project.id == project_id)
+  if not_modified:
+    return not_modified
   result = await db.execute(select(Project).where(Project.id == project_id))
   project = result.scalar_one_or_none()
   if not project:
     raise HTTPException(status_code=404, detail="Project not found")
-  return project
+  return await response_cache.store(key, response, _PROJECT, project)
 
 
   
\ No newline at end of file
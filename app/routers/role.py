@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from uuid import uuid4
 
+from app.core.crud import delete_returning, update_returning
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, principal_cache
+from app.core.etag import row_conditional, scope_conditional
+from app.core.permissions import role_registry
 from app.models.role import Role
 from app.models.role_permission import RolePermission
 from app.models.permission import Permission
@@ -18,15 +21,23 @@ router = APIRouter(
 
 
 @router.get("/", response_model=list[RoleOut])
-async def get_roles(db: AsyncSession = Depends(get_db)):
+async def get_roles(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Public — returns all active roles (used on signup page)."""
+    not_modified = await scope_conditional(request, response, db, Role.modified_at)
+    if not_modified:
+        return not_modified
     result = await db.execute(select(Role).order_by(Role.role_name))
     roles = result.scalars().all()
     return roles
 
 
 @router.get("/{role_id}", response_model=RoleOut, dependencies=[Depends(get_current_user)])
-async def get_role(role_id: str, db: AsyncSession = Depends(get_db)):
+async def get_role(
+    role_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    not_modified = await row_conditional(request, response, db, Role.modified_at, Role.id == role_id)
+    if not_modified:
+        return not_modified
     result = await db.execute(select(Role).where(Role.id == role_id))
     role = result.scalar_one_or_none()
     if not role:
@@ -47,6 +58,7 @@ async def create_role(data: RoleCreate, db: AsyncSession = Depends(get_db)):
     db.add(role)
     await db.commit()
     await db.refresh(role)
+    role_registry.invalidate(role.id)
     return role
 
 
@@ -54,28 +66,23 @@ async def create_role(data: RoleCreate, db: AsyncSession = Depends(get_db)):
 async def update_role(
     role_id: str, data: RoleUpdate, db: AsyncSession = Depends(get_db)
 ):
-    result = await db.execute(select(Role).where(Role.id == role_id))
-    role = result.scalar_one_or_none()
-    if not role:
-        raise HTTPException(status_code=404, detail="Role not found")
-
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(role, field, value)
-
-    await db.commit()
-    await db.refresh(role)
+    values = data.model_dump(exclude_unset=True)
+    # Tokens and /auth/me ETags embed the role name, so a rename is a new version too
+    values["permissions_version"] = Role.permissions_version + 1
+    (role,) = await update_returning(
+        db, Role, role_id, values, "Role", conflict="Role name already exists"
+    )
+    role_registry.invalidate(role_id)
     return role
 
 
 @router.delete("/{role_id}", status_code=204, dependencies=[Depends(get_current_user)])
 async def delete_role(role_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Role).where(Role.id == role_id))
-    role = result.scalar_one_or_none()
-    if not role:
-        raise HTTPException(status_code=404, detail="Role not found")
-
-    await db.delete(role)
-    await db.commit()
+    # role_permissions rows go with it (ON DELETE CASCADE)
+    await delete_returning(db, Role, role_id, "Role")
+    # ON DELETE SET NULL rewrote users.role_id for every holder of this role.
+    principal_cache.clear()
+    role_registry.invalidate(role_id)
 
 
 # ─── Role permission endpoints ────────────────────────────────────────────────
@@ -132,8 +139,15 @@ async def update_role_permission(
         raise HTTPException(status_code=404, detail="Role-permission pair not found")
 
     rp.is_granted = data.is_granted
+    # Stateless tokens minted before this change now carry an outdated version
+    await db.execute(
+        update(Role)
+        .where(Role.id == role_id)
+        .values(permissions_version=Role.permissions_version + 1)
+    )
     await db.commit()
     await db.refresh(rp)
+    role_registry.invalidate(role_id)
 
     return RolePermissionOut(
         role_permission_id=rp.id,
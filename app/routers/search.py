@@ -0,0 +1,110 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, cast, literal, null, select, text, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from uuid import UUID
+from app.core.config import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.response_cache import response_cache
+from app.core.serialization import Serializer
+from app.core.search import rank, to_query
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user_story import UserStory
+from app.schemas.search import SearchHit
+
+router = APIRouter(
+  prefix="/search",
+  tags=["search"],
+  dependencies=[Depends(get_current_user)],
+)
+
+_HITS = Serializer(SearchHit, many=True)
+
+# Not mapped on the models (see app/models/task.py)
+_TASK_VECTOR = Task.__table__.c.search_vector
+_STORY_VECTOR = UserStory.__table__.c.search_vector
+
+# Any task or story write can change results, so hits depend on all four list scopes
+_SCOPES = ("tasks", "tasks:all", "user-stories", "user-stories:all")
+
+_CUSTOM_PLAN = text("SET LOCAL plan_cache_mode = force_custom_plan")
+
+# ranked matches in task and story titles/descriptions within a project or sprint
+@router.get("/", response_model=list[SearchHit])
+async def search(
+  request: Request,
+  response: Response,
+  q: str = Query(..., min_length=1, max_length=200, description='Web-search syntax: words, "phrases", -excluded, or'),
+  project_id: UUID | None = Query(None),
+  sprint_id: UUID | None = Query(None),
+  kind: Literal["task", "story"] | None = Query(None, description="Only tasks or only stories"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  offset: int = Query(0, ge=0),
+  db: AsyncSession = Depends(get_db),
+):
+  if project_id is None and sprint_id is None:
+    raise HTTPException(status_code=400, detail="Pass project_id or sprint_id")
+
+  cached, key = await response_cache.lookup(request, _SCOPES, db)
+  if cached:
+    return cached
+
+  query = to_query(q)
+  story_scope = []
+  if sprint_id is not None:
+    story_scope.append(UserStory.sprint_id == sprint_id)
+  if project_id is not None:
+    story_scope.append(UserStory.sprint_id.in_(select(Sprint.id).where(Sprint.project_id == project_id)))
+
+  branches = []
+  if kind in (None, "task"):
+    branches.append(
+      select(
+        literal("task", String).label("kind"),
+        Task.id,
+        Task.task_no.label("number"),
+        Task.title,
+        Task.status,
+        Task.user_story_id,
+        UserStory.sprint_id,
+        rank(_TASK_VECTOR, query).label("rank"),
+      )
+      .join(UserStory, Task.user_story_id == UserStory.id)
+      .where(_TASK_VECTOR.op("@@")(query), *story_scope)
+    )
+  if kind in (None, "story"):
+    branches.append(
+      select(
+        literal("story", String).label("kind"),
+        UserStory.id,
+        UserStory.user_story_no.label("number"),
+        UserStory.title,
+        UserStory.status,
+        cast(null(), PG_UUID(as_uuid=True)).label("user_story_id"),
+        UserStory.sprint_id,
+        rank(_STORY_VECTOR, query).label("rank"),
+      )
+      .where(_STORY_VECTOR.op("@@")(query), *story_scope)
+    )
+  hits = union_all(*branches).subquery() if len(branches) > 1 else branches[0].subquery()
+  # From its sixth run a prepared statement may switch to a generic plan,
+  # which cannot see how selective the query or the scope is and scans the
+  # project's matches even for a sprint search.
+  await db.execute(_CUSTOM_PLAN)
+  result = await db.execute(
+    select(hits)
+    .order_by(hits.c.rank.desc(), hits.c.id)
+    .offset(offset)
+    .limit(limit + 1)
+  )
+  rows = result.all()
+
+  # Offset paging: relevance has no stable key to seek on
+  if len(rows) > limit:
+    rows = rows[:limit]
+    next_url = request.url.include_query_params(offset=offset + limit, limit=limit)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+  return await response_cache.store(key, response, _HITS, rows)
@@ -1,12 +1,17 @@
 # Create routes for sprint CRUD operations
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from uuid import UUID
+from sqlalchemy import insert, literal, select, update
+from uuid import UUID, uuid4
 from typing import List
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import row_conditional, scope_conditional
+from app.core.pagination import Pagination
+from app.core.response_cache import response_cache
+from app.core.serialization import Serializer
 from app.schemas.sprint import SprintCreate, SprintOut
+from app.models.project import Project
 from app.models.sprint import Sprint
 
 router = APIRouter(
@@ -15,41 +20,89 @@ router = APIRouter(
   dependencies=[Depends(get_current_user)],
 )
 
+_SPRINT = Serializer(SprintOut)
+_SPRINTS = Serializer(SprintOut, many=True)
+
 # create a new sprint
 @router.post("/", response_model=SprintOut)
 async def create_sprint(data: SprintCreate, db: AsyncSession = Depends(get_db)):
-  # Use MAX(sprint_number) + 1 so deletions never cause a unique constraint violation
-  result = await db.execute(
-    select(func.max(Sprint.sprint_number)).where(Sprint.project_id == data.project_id)
+  # Allocate the number and insert in one statement:
+  #   WITH counter AS (UPDATE projects SET last_sprint_number = last_sprint_number + 1
+  #                    WHERE id = :project_id RETURNING last_sprint_number)
+  #   INSERT INTO sprints (...) SELECT ..., counter.last_sprint_number FROM counter
+  # The row lock on the project serializes concurrent creates for that project
+  # only, numbers never repeat, and a failed insert rolls the counter back.
+  counter = (
+    update(Project)
+    .where(Project.id == data.project_id)
+    # Keep updated_at: the counter is not part of the project's representation
+    .values(last_sprint_number=Project.last_sprint_number + 1, updated_at=Project.updated_at)
+    .returning(Project.last_sprint_number)
+    .cte("counter")
   )
-  max_number = result.scalar() or 0
-  next_sprint_number = max_number + 1
-
-  sprint = Sprint(**data.model_dump(), sprint_number=next_sprint_number)
-  db.add(sprint)
+  values = {"id": uuid4(), **data.model_dump()}
+  columns = Sprint.__table__.c
+  stmt = (
+    insert(Sprint)
+    .from_select(
+      [*values, "sprint_number"],
+      select(
+        *(literal(value, columns[key].type) for key, value in values.items()),
+        counter.c.last_sprint_number,
+      ),
+    )
+    .returning(Sprint)
+  )
+  result = await db.execute(stmt)
+  sprint = result.scalar_one_or_none()
+  if not sprint:
+    raise HTTPException(status_code=404, detail="Project not found")
   await db.commit()
-  await db.refresh(sprint)
+  await response_cache.invalidate("sprints:all", f"project-sprints:{sprint.project_id}")
   return sprint
 
 # get all sprints
 @router.get("/", response_model=List[SprintOut])
-async def get_sprints(db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Sprint))
-  sprints = result.scalars().all()
-  return sprints
+async def get_sprints(page: Pagination = Depends(), db: AsyncSession = Depends(get_db)):
+  cached, key = await response_cache.lookup(page.request, ("sprints:all",), db)
+  if cached:
+    return cached
+  sprints = await page.fetch(db, select(Sprint), (Sprint.created_at, Sprint.id))
+  return await response_cache.store(key, page.response, _SPRINTS, sprints)
 
 # get a sprint by id
 @router.get("/{sprint_id}", response_model=SprintOut)
-async def get_sprint(sprint_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_sprint(
+  sprint_id: UUID,
+  request: Request,
+  response: Response,
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(request, (f"sprint:{sprint_id}",), db)
+  if cached:
+    return cached
+  not_modified = await row_conditional(request, response, db, Sprint.updated_at, Sprint.id == sprint_id)
+  if not_modified:
+    return not_modified
   result = await db.execute(select(Sprint).where(Sprint.id == sprint_id))
   sprint = result.scalar_one_or_none()
   if not sprint:
     raise HTTPException(status_code=404, detail="Sprint not found")
-  return sprint
+  return await response_cache.store(key, response, _SPRINT, sprint)
 
 # get sprints by project id
 @router.get("/project/{project_id}", response_model=List[SprintOut])
-async def get_sprints_by_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Sprint).where(Sprint.project_id == project_id))
-  sprints = result.scalars().all()
-  return sprints
\ No newline at end of file
+async def get_sprints_by_project(
+  project_id: UUID,
+  page: Pagination = Depends(),
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(page.request, (f"project-sprints:{project_id}",), db)
+  if cached:
+    return cached
+  scope = Sprint.project_id == project_id
+  not_modified = await scope_conditional(page.request, page.response, db, Sprint.updated_at, scope)
+  if not_modified:
+    return not_modified
+  sprints = await page.fetch(db, select(Sprint).where(scope), (Sprint.created_at, Sprint.id))
+  return await response_cache.store(key, page.response, _SPRINTS, sprints)
\ No newline at end of file
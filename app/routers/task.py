@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import aliased
 from uuid import UUID
+from app.core.bulk import BulkSpec, ForeignKeyCheck, apply_bulk
+from app.core.crud import delete_returning, update_returning
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import row_conditional, scope_conditional
+from app.core.pagination import Pagination
+from app.core.response_cache import response_cache
+from app.core.serialization import Serializer
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskOut
+from app.models.user import User
+from app.models.user_story import UserStory
+from app.schemas.task import TaskBulkRequest, TaskBulkResult, TaskCreate, TaskOut, TaskUpdate
 
 router = APIRouter(
   prefix="/tasks",
@@ -13,55 +22,103 @@ router = APIRouter(
   dependencies=[Depends(get_current_user)],
 )
 
+# Cached GETs depend on "tasks" (bumped by bulk writes) plus their own scope
+_TASK = Serializer(TaskOut)
+_TASKS = Serializer(TaskOut, many=True)
+
 @router.post("/", response_model=TaskOut)
 async def create_task(data: TaskCreate, db: AsyncSession = Depends(get_db)):
   task = Task(**data.model_dump())
   db.add(task)
   await db.commit()
   await db.refresh(task)
+  await response_cache.invalidate("tasks:all", f"story-tasks:{task.user_story_id}")
   return task
 
+_BULK_SPEC = BulkSpec(
+  model=Task,
+  label="Task",
+  not_null=("user_story_id", "title", "status"),
+  foreign_keys=(
+    ForeignKeyCheck("user_story_id", UserStory.id, "User story"),
+    ForeignKeyCheck("assignee_id", User.id, "Assignee"),
+  ),
+)
+
+# apply many creates/patches/deletes in one transaction
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_tasks(data: TaskBulkRequest, db: AsyncSession = Depends(get_db)):
+  outcome = await apply_bulk(db, _BULK_SPEC, data.creates, data.updates, data.deletes, data.atomic)
+  await response_cache.invalidate("tasks")
+  return outcome
+
 @router.get("/", response_model=list[TaskOut])
-async def get_tasks(db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Task))
-  tasks = result.scalars().all()
-  return tasks
+async def get_tasks(page: Pagination = Depends(), db: AsyncSession = Depends(get_db)):
+  cached, key = await response_cache.lookup(page.request, ("tasks", "tasks:all"), db)
+  if cached:
+    return cached
+  tasks = await page.fetch(db, select(Task), (Task.task_no,))
+  return await response_cache.store(key, page.response, _TASKS, tasks)
 
 @router.get("/user-story/{user_story_id}", response_model=list[TaskOut])
-async def get_tasks_by_user_story(user_story_id: UUID, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Task).where(Task.user_story_id == user_story_id))
-  tasks = result.scalars().all()
-  return tasks
+async def get_tasks_by_user_story(
+  user_story_id: UUID,
+  page: Pagination = Depends(),
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(page.request, ("tasks", f"story-tasks:{user_story_id}"), db)
+  if cached:
+    return cached
+  scope = Task.user_story_id == user_story_id
+  not_modified = await scope_conditional(page.request, page.response, db, Task.updated_at, scope)
+  if not_modified:
+    return not_modified
+  tasks = await page.fetch(db, select(Task).where(scope), (Task.task_no,))
+  return await response_cache.store(key, page.response, _TASKS, tasks)
 
 @router.get("/{task_id}", response_model=TaskOut)
-async def get_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_task(
+  task_id: UUID,
+  request: Request,
+  response: Response,
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(request, ("tasks", f"task:{task_id}"), db)
+  if cached:
+    return cached
+  not_modified = await row_conditional(request, response, db, Task.updated_at, Task.id == task_id)
+  if not_modified:
+    return not_modified
   result = await db.execute(select(Task).where(Task.id == task_id))
   task = result.scalar_one_or_none()
   if not task:
     raise HTTPException(status_code=404, detail="Task not found")
+  return await response_cache.store(key, response, _TASK, task)
+
+async def _update_task(db: AsyncSession, task_id: UUID, values: dict) -> Task:
+  # Evaluated in RETURNING, this still sees the pre-update row
+  previous = aliased(Task)
+  previous_story_id = select(previous.user_story_id).where(previous.id == task_id).scalar_subquery()
+  task, old_story_id = await update_returning(
+    db, Task, task_id, values, "Task", previous_story_id,
+    conflict="User story or assignee not found, or a required field is null",
+  )
+  await response_cache.invalidate(
+    f"task:{task_id}", "tasks:all", f"story-tasks:{old_story_id}", f"story-tasks:{task.user_story_id}"
+  )
   return task
 
 @router.put("/{task_id}", response_model=TaskOut)
 async def update_task(task_id: UUID, data: TaskCreate, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Task).where(Task.id == task_id))
-  task = result.scalar_one_or_none()
-  if not task:
-    raise HTTPException(status_code=404, detail="Task not found")
-  
-  for key, value in data.model_dump().items():
-    setattr(task, key, value)
-  
-  await db.commit()
-  await db.refresh(task)
-  return task
+  return await _update_task(db, task_id, data.model_dump())
+
+# sparse update: only the fields present in the body are written
+@router.patch("/{task_id}", response_model=TaskOut)
+async def patch_task(task_id: UUID, data: TaskUpdate, db: AsyncSession = Depends(get_db)):
+  return await _update_task(db, task_id, data.model_dump(exclude_unset=True))
 
 @router.delete("/{task_id}")
 async def delete_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(Task).where(Task.id == task_id))
-  task = result.scalar_one_or_none()
-  if not task:
-    raise HTTPException(status_code=404, detail="Task not found")
-  
-  await db.delete(task)
-  await db.commit()
+  task = await delete_returning(db, Task, task_id, "Task", Task.user_story_id)
+  await response_cache.invalidate(f"task:{task_id}", "tasks:all", f"story-tasks:{task.user_story_id}")
   return {"message": "Task deleted successfully"}
@@ -1,43 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import uuid4
 from datetime import datetime
 
+from app.core.crud import delete_returning, update_returning
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.core.permissions import build_permissions_map
+from app.core.dependencies import get_current_user, invalidate_principal
+from app.core.pagination import Pagination
+from app.core.permissions import role_registry
+from app.core.serialization import Serializer, respond
 from app.models.user import User
 from app.models.role import Role
-from app.models.role_permission import RolePermission
-from app.schemas.user import UserCreate, UserUpdate, UserOut
-
-# Reusable selectinload chain for deep-loading role → role_permissions → permission
-_ROLE_PERMISSIONS_LOAD = (
-    selectinload(User.role_info)
-    .selectinload(Role.role_permissions)
-    .selectinload(RolePermission.permission)
-)
-
-
-def _enrich_user(user: User) -> dict:
-    """Attach role_name and permissions from the loaded relationships (if any)."""
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "role_id": user.role_id,
-        "role_name": user.role_info.role_name if user.role_info else None,
-        "status": user.status,
-        "last_modified_on": user.last_modified_on,
-        "last_modified_by": user.last_modified_by,
-        "avatar_url": user.avatar_url,
-        "auth_provider": user.auth_provider,
-        "created_at": user.created_at,
-        "permissions": build_permissions_map(user),
-    }
+from app.schemas.user import UserCreate, UserUpdate, UserOut, user_payload
 
+_USERS = Serializer(UserOut, many=True)
 
 router = APIRouter(
     prefix="/users",
@@ -47,23 +24,20 @@ router = APIRouter(
 
 
 @router.get("/", response_model=list[UserOut])
-async def get_users(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).order_by(User.name)
-    )
-    users = result.scalars().all()
-    return [_enrich_user(u) for u in users]
+async def get_users(page: Pagination = Depends(), db: AsyncSession = Depends(get_db)):
+    users = await page.fetch(db, select(User), (User.created_at, User.id))
+    roles = await role_registry.get_many(db, (u.role_id for u in users))
+    payload = [user_payload(u, roles.get(str(u.role_id))) for u in users]
+    return respond(_USERS.dump_json(payload), page.response)
 
 
 @router.get("/{user_id}", response_model=UserOut)
 async def get_user(user_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user_id)
-    )
+    result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return _enrich_user(user)
+    return user_payload(user, await role_registry.get(db, user.role_id))
 
 
 @router.post("/", response_model=UserOut)
@@ -83,12 +57,8 @@ async def create_user(data: UserCreate, db: AsyncSession = Depends(get_db)):
     )
     db.add(user)
     await db.commit()
-
-    result2 = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user.id)
-    )
-    user = result2.scalar_one()
-    return _enrich_user(user)
+    await db.refresh(user)
+    return user_payload(user, await role_registry.get(db, user.role_id))
 
 
 @router.put("/{user_id}", response_model=UserOut)
@@ -98,54 +68,41 @@ async def update_user(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if data.email and data.email != user.email:
-        email_check = await db.execute(select(User).where(User.email == data.email))
-        if email_check.scalar_one_or_none():
+    values = {}
+    if data.email:
+        email_check = await db.execute(
+            select(User.id).where(User.email == data.email, User.id != user_id)
+        )
+        if email_check.first():
             raise HTTPException(status_code=400, detail="Email already registered")
-        user.email = data.email
+        values["email"] = data.email
 
     if data.name is not None:
-        user.name = data.name
+        values["name"] = data.name
 
     if data.role_id is not None:
-        role_res = await db.execute(
-            select(Role).where(Role.id == str(data.role_id))
-        )
-        role = role_res.scalar_one_or_none()
-        if not role:
+        role_res = await db.execute(select(Role.id).where(Role.id == str(data.role_id)))
+        if not role_res.first():
             raise HTTPException(status_code=404, detail="Role not found")
-        user.role_id = str(data.role_id)
+        values["role_id"] = str(data.role_id)
 
     if data.status is not None:
-        user.status = data.status
-
-    user.last_modified_on = datetime.now()
-    user.last_modified_by = str(current_user.id)
+        values["status"] = data.status
 
-    await db.commit()
+    values["last_modified_on"] = datetime.now()
+    values["last_modified_by"] = str(current_user.id)
 
-    result2 = await db.execute(
-        select(User).options(_ROLE_PERMISSIONS_LOAD).where(User.id == user_id)
+    (user,) = await update_returning(
+        db, User, user_id, values, "User", conflict="Email already registered"
     )
-    user = result2.scalar_one()
-    return _enrich_user(user)
+    invalidate_principal(user_id)
+    return user_payload(user, await role_registry.get(db, user.role_id))
 
 
 @router.delete("/{user_id}", status_code=200)
 async def delete_user(user_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    await db.delete(user)
-    await db.commit()
+    await delete_returning(
+        db, User, user_id, "User", conflict="User still owns projects or has assigned work"
+    )
+    invalidate_principal(user_id)
     return {"message": "User deleted successfully"}
-
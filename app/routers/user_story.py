@@ -1,11 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import aliased
 from uuid import UUID
+from app.core.bulk import BulkSpec, ForeignKeyCheck, apply_bulk
+from app.core.crud import delete_returning, update_returning
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import row_conditional, scope_conditional
+from app.core.pagination import Pagination
+from app.core.response_cache import response_cache
+from app.core.serialization import Serializer
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
 from app.models.user_story import UserStory
-from app.schemas.user_story import UserStoryCreate, UserStoryOut
+from app.schemas.user_story import (
+  UserStoryBulkRequest,
+  UserStoryBulkResult,
+  UserStoryCreate,
+  UserStoryOut,
+  UserStoryUpdate,
+)
 
 router = APIRouter(
   prefix="/user-stories",
@@ -13,55 +29,112 @@ router = APIRouter(
   dependencies=[Depends(get_current_user)],
 )
 
+# Cached GETs depend on "user-stories" (bumped by bulk writes) plus their own scope
+_USER_STORY = Serializer(UserStoryOut)
+_USER_STORIES = Serializer(UserStoryOut, many=True)
+
 @router.post("/", response_model=UserStoryOut)
 async def create_user_story(data: UserStoryCreate, db: AsyncSession = Depends(get_db)):
   user_story = UserStory(**data.model_dump())
   db.add(user_story)
   await db.commit()
   await db.refresh(user_story)
+  await response_cache.invalidate("user-stories:all", f"sprint-stories:{user_story.sprint_id}")
   return user_story
 
+_BULK_SPEC = BulkSpec(
+  model=UserStory,
+  label="User story",
+  not_null=("sprint_id", "title", "status"),
+  foreign_keys=(
+    ForeignKeyCheck("sprint_id", Sprint.id, "Sprint"),
+    ForeignKeyCheck("assignee_id", User.id, "Assignee"),
+  ),
+  delete_guards=((Task.user_story_id, "User story still has tasks"),),
+)
+
+# apply many creates/patches/deletes in one transaction
+@router.post("/bulk", response_model=UserStoryBulkResult)
+async def bulk_user_stories(data: UserStoryBulkRequest, db: AsyncSession = Depends(get_db)):
+  outcome = await apply_bulk(db, _BULK_SPEC, data.creates, data.updates, data.deletes, data.atomic)
+  await response_cache.invalidate("user-stories")
+  return outcome
+
 @router.get("/", response_model=list[UserStoryOut])
-async def get_user_stories(db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(UserStory))
-  user_stories = result.scalars().all()
-  return user_stories
+async def get_user_stories(page: Pagination = Depends(), db: AsyncSession = Depends(get_db)):
+  cached, key = await response_cache.lookup(page.request, ("user-stories", "user-stories:all"), db)
+  if cached:
+    return cached
+  user_stories = await page.fetch(db, select(UserStory), (UserStory.user_story_no,))
+  return await response_cache.store(key, page.response, _USER_STORIES, user_stories)
 
 @router.get("/sprint/{sprint_id}", response_model=list[UserStoryOut])
-async def get_user_stories_by_sprint(sprint_id: UUID, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(UserStory).where(UserStory.sprint_id == sprint_id))
-  user_stories = result.scalars().all()
-  return user_stories
+async def get_user_stories_by_sprint(
+  sprint_id: UUID,
+  page: Pagination = Depends(),
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(page.request, ("user-stories", f"sprint-stories:{sprint_id}"), db)
+  if cached:
+    return cached
+  scope = UserStory.sprint_id == sprint_id
+  not_modified = await scope_conditional(page.request, page.response, db, UserStory.updated_at, scope)
+  if not_modified:
+    return not_modified
+  user_stories = await page.fetch(db, select(UserStory).where(scope), (UserStory.user_story_no,))
+  return await response_cache.store(key, page.response, _USER_STORIES, user_stories)
 
 @router.get("/{user_story_id}", response_model=UserStoryOut)
-async def get_user_story(user_story_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user_story(
+  user_story_id: UUID,
+  request: Request,
+  response: Response,
+  db: AsyncSession = Depends(get_db),
+):
+  cached, key = await response_cache.lookup(request, ("user-stories", f"user-story:{user_story_id}"), db)
+  if cached:
+    return cached
+  not_modified = await row_conditional(request, response, db, UserStory.updated_at, UserStory.id == user_story_id)
+  if not_modified:
+    return not_modified
   result = await db.execute(select(UserStory).where(UserStory.id == user_story_id))
   user_story = result.scalar_one_or_none()
   if not user_story:
     raise HTTPException(status_code=404, detail="User story not found")
+  return await response_cache.store(key, response, _USER_STORY, user_story)
+
+async def _update_user_story(db: AsyncSession, user_story_id: UUID, values: dict) -> UserStory:
+  # Evaluated in RETURNING, this still sees the pre-update row
+  previous = aliased(UserStory)
+  previous_sprint_id = select(previous.sprint_id).where(previous.id == user_story_id).scalar_subquery()
+  user_story, old_sprint_id = await update_returning(
+    db, UserStory, user_story_id, values, "User story", previous_sprint_id,
+    conflict="Sprint or assignee not found, or a required field is null",
+  )
+  await response_cache.invalidate(
+    f"user-story:{user_story_id}",
+    "user-stories:all",
+    f"sprint-stories:{old_sprint_id}",
+    f"sprint-stories:{user_story.sprint_id}",
+  )
   return user_story
 
 @router.put("/{user_story_id}", response_model=UserStoryOut)
 async def update_user_story(user_story_id: UUID, data: UserStoryCreate, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(UserStory).where(UserStory.id == user_story_id))
-  user_story = result.scalar_one_or_none()
-  if not user_story:
-    raise HTTPException(status_code=404, detail="User story not found")
-  
-  for key, value in data.model_dump().items():
-    setattr(user_story, key, value)
-  
-  await db.commit()
-  await db.refresh(user_story)
-  return user_story
+  return await _update_user_story(db, user_story_id, data.model_dump())
+
+# sparse update: only the fields present in the body are written
+@router.patch("/{user_story_id}", response_model=UserStoryOut)
+async def patch_user_story(user_story_id: UUID, data: UserStoryUpdate, db: AsyncSession = Depends(get_db)):
+  return await _update_user_story(db, user_story_id, data.model_dump(exclude_unset=True))
 
 @router.delete("/{user_story_id}")
 async def delete_user_story(user_story_id: UUID, db: AsyncSession = Depends(get_db)):
-  result = await db.execute(select(UserStory).where(UserStory.id == user_story_id))
-  user_story = result.scalar_one_or_none()
-  if not user_story:
-    raise HTTPException(status_code=404, detail="User story not found")
-  
-  await db.delete(user_story)
-  await db.commit()
+  user_story = await delete_returning(
+    db, UserStory, user_story_id, "User story", UserStory.sprint_id,
+    conflict="User story still has tasks",
+  )
+  await response_cache.invalidate(
+    f"user-story:{user_story_id}", "user-stories:all", f"sprint-stories:{user_story.sprint_id}"
+  )
   return {"message": "User story deleted successfully"}
@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import date
+
+class StatusCount(BaseModel):
+  status: str
+  count: int
+  # estimated hours; always 0 for stories
+  hours: int = 0
+
+class WorkSummaryOut(BaseModel):
+  tasks_by_status: list[StatusCount]
+  stories_by_status: list[StatusCount]
+  total_hours: int
+  remaining_hours: int
+
+class BurndownPoint(BaseModel):
+  day: date
+  total_hours: int
+  remaining_hours: int
+  tasks_total: int
+  tasks_done: int
+  stories_total: int
+  stories_done: int
+
+class BurndownOut(BaseModel):
+  sprint_id: UUID
+  start_date: date | None
+  end_date: date | None
+  # one point per day, each the state at the end of that day
+  days: list[BurndownPoint]
+
+class SprintVelocity(BaseModel):
+  sprint_id: UUID
+  name: str
+  sprint_number: int | None
+  status: str
+  start_date: date | None
+  end_date: date | None
+  committed_hours: int
+  completed_hours: int
+  completed_tasks: int
+  completed_stories: int
+
+class VelocityOut(BaseModel):
+  project_id: UUID
+  # oldest first
+  sprints: list[SprintVelocity]
+  average_completed_hours: float
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from app.schemas.project import ProjectOut
+from app.schemas.sprint import SprintOut
+from app.schemas.task import TaskOut
+from app.schemas.user_story import UserStoryOut
+
+class BoardStoryOut(UserStoryOut):
+  tasks: list[TaskOut] = []
+
+class SprintBoardOut(BaseModel):
+  sprint: SprintOut
+  stories: list[BoardStoryOut]
+
+class ProjectBoardOut(BaseModel):
+  project: ProjectOut
+  sprints: list[SprintBoardOut]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from uuid import UUID
+
+class BulkItemError(BaseModel):
+  op: str            # "create" | "update" | "delete"
+  index: int         # position of the item in its request list
+  id: UUID | None = None
+  detail: str
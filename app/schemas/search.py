@@ -0,0 +1,18 @@
+from typing import Literal
+from pydantic import BaseModel
+from uuid import UUID
+
+class SearchHit(BaseModel):
+  kind: Literal["task", "story"]
+  id: UUID
+  # task_no or user_story_no
+  number: int
+  title: str
+  status: str
+  # None for stories
+  user_story_id: UUID | None
+  sprint_id: UUID
+  rank: float
+
+  class Config:
+    from_attributes = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
+from app.schemas.bulk import BulkItemError
 
 class TaskCreate(BaseModel):
   user_story_id: UUID
@@ -23,3 +24,28 @@ class TaskOut(BaseModel):
 
   class Config:
     from_attributes = True
+
+class TaskUpdate(BaseModel):
+  """Sparse update: only the fields present in the body are written."""
+  user_story_id: UUID | None = None
+  title: str | None = None
+  description: str | None = None
+  status: str | None = None
+  estimated_hours: int | None = None
+  assignee_id: UUID | None = None
+
+class TaskBulkUpdate(TaskUpdate):
+  id: UUID
+
+class TaskBulkRequest(BaseModel):
+  creates: list[TaskCreate] = []
+  updates: list[TaskBulkUpdate] = []
+  deletes: list[UUID] = []
+  # True: any invalid item rejects the whole batch; False: skip and report it
+  atomic: bool = False
+
+class TaskBulkResult(BaseModel):
+  created: list[TaskOut] = []
+  updated: list[TaskOut] = []
+  deleted: list[UUID] = []
+  errors: list[BulkItemError] = []
@@ -1,7 +1,13 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+from app.core.permissions import NO_PERMISSIONS
+
+if TYPE_CHECKING:
+    from app.core.permissions import CompiledRole
+    from app.models.user import User
 
 
 class UserCreate(BaseModel):
@@ -36,3 +42,25 @@ class UserOut(BaseModel):
     class Config:
         from_attributes = True
 
+
+def user_payload(user: "User", role: Optional["CompiledRole"]) -> dict[str, Any]:
+    """A UserOut as a plain dict of the user's columns and its compiled role.
+
+    Every value is already JSON-ready, so lists of these are encoded as they
+    are, without another validation pass.  The permissions map is shared with
+    the role; do not mutate it.
+    """
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role_id": user.role_id,
+        "role_name": role.name if role else None,
+        "status": user.status,
+        "last_modified_on": user.last_modified_on,
+        "last_modified_by": user.last_modified_by,
+        "avatar_url": user.avatar_url,
+        "auth_provider": user.auth_provider,
+        "created_at": user.created_at,
+        "permissions": role.permissions if role else NO_PERMISSIONS,
+    }
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
+from app.schemas.bulk import BulkItemError
 
 class UserStoryCreate(BaseModel):
   sprint_id: UUID
@@ -23,3 +24,28 @@ class UserStoryOut(BaseModel):
 
   class Config:
     from_attributes = True
+
+class UserStoryUpdate(BaseModel):
+  """Sparse update: only the fields present in the body are written."""
+  sprint_id: UUID | None = None
+  title: str | None = None
+  description: str | None = None
+  status: str | None = None
+  priority: int | None = None
+  assignee_id: UUID | None = None
+
+class UserStoryBulkUpdate(UserStoryUpdate):
+  id: UUID
+
+class UserStoryBulkRequest(BaseModel):
+  creates: list[UserStoryCreate] = []
+  updates: list[UserStoryBulkUpdate] = []
+  deletes: list[UUID] = []
+  # True: any invalid item rejects the whole batch; False: skip and report it
+  atomic: bool = False
+
+class UserStoryBulkResult(BaseModel):
+  created: list[UserStoryOut] = []
+  updated: list[UserStoryOut] = []
+  deleted: list[UUID] = []
+  errors: list[BulkItemError] = []
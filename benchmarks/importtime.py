@@ -0,0 +1,106 @@
+"""Cold-start cost: import time of app.main and time to the first response.
+
+Starts ``--runs`` fresh interpreters with ``python -X importtime``, each of
+which imports app.main and answers one ``GET /`` in-process (no database
+needed; the lifespan warm-up is not part of it).  Reports the median import
+time, the median time to the first response, and the packages and modules
+that take longest to import in the median run.  Each run appends a line to
+``--history``, as benchmarks.micro does.
+
+    DATABASE_URL=postgresql+asyncpg://u:p@localhost/db python -m benchmarks.importtime --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.micro import _git_commit, _machine
+
+DEFAULT_HISTORY = Path(__file__).parent / "history" / "importtime.jsonl"
+
+# Runs in the child; prints the timings as one JSON line on stdout
+_CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import httpx
+from app.main import app
+imported = time.perf_counter()
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get("/")).raise_for_status()
+asyncio.run(first_request())
+print(json.dumps({"import_ms": (imported - started) * 1000, "first_response_ms": (time.perf_counter() - started) * 1000}))
+"""
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """``(module, depth, self us, cumulative us)`` for every ``-X importtime`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once() -> dict:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _CHILD], capture_output=True, text=True, check=False)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-2000:])
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["modules"] = _parse_importtime(proc.stderr)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="slowest entries to list")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args()
+
+    run_once()  # fills the bytecode cache, so every measured run starts alike
+    runs = sorted((run_once() for _ in range(args.runs)), key=lambda r: r["import_ms"])
+    median = runs[len(runs) // 2]
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    first_response_ms = statistics.median(r["first_response_ms"] for r in runs)
+    print(f"import app.main   {import_ms:8.1f} ms")
+    print(f"first response    {first_response_ms:8.1f} ms  (import included)")
+
+    # Own import time of every module, summed per top-level package
+    packages: dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in median["modules"]:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'package':32} {'ms':>8}")
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:32} {us / 1000:>8.1f}")
+
+    print(f"\n{'module':48} {'self ms':>8}")
+    for name, _, self_us, _ in sorted(median["modules"], key=lambda row: -row[2])[:args.top]:
+        print(f"{name:48} {self_us / 1000:>8.1f}")
+
+    if not args.no_record:
+        entry = {
+            "commit": _git_commit(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": _machine(),
+            "import_ms": round(import_ms, 1),
+            "first_response_ms": round(first_response_ms, 1),
+            "packages_ms": {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda i: -i[1])[:args.top]},
+        }
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a") as history:
+            history.write(json.dumps(entry) + "\n")
+        print(f"\nrecorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Fail when a hot route query would fall back to a sequential scan.
+
+EXPLAINs the statements behind the board-polling and by-parent routes, plus
+the FK lookups Postgres runs when a parent row is deleted.  Sequential scans
+are disabled for the session, so the planner only picks one when no usable
+index exists; the verdict therefore does not depend on table sizes and an
+empty, migrated database is enough (seeded data works just as well).
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.index_coverage
+"""
+import asyncio
+import sys
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, delete, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import engine
+from app.core.search import to_query
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+
+_ID = UUID(int=1)
+_CREATED = datetime(2026, 1, 1)
+
+# (label, statement) — keep in step with the queries issued by app/routers.
+HOT_QUERIES: list[tuple[str, Select]] = [
+    ("get_current_user", select(User).where(User.id == _ID)),
+    ("users list", select(User).order_by(User.created_at, User.id)),
+    ("users page", select(User).where(tuple_(User.created_at, User.id) > tuple_(_CREATED, _ID)).order_by(User.created_at, User.id).limit(101)),
+    ("projects list", select(Project).order_by(Project.created_at, Project.id)),
+    ("projects page", select(Project).where(tuple_(Project.created_at, Project.id) > tuple_(_CREATED, _ID)).order_by(Project.created_at, Project.id).limit(101)),
+    ("sprints list", select(Sprint).order_by(Sprint.created_at, Sprint.id)),
+    ("sprints page", select(Sprint).where(tuple_(Sprint.created_at, Sprint.id) > tuple_(_CREATED, _ID)).order_by(Sprint.created_at, Sprint.id).limit(101)),
+    ("sprints by project", select(Sprint).where(Sprint.project_id == _ID).order_by(Sprint.created_at, Sprint.id).limit(101)),
+    ("sprints by project, page", select(Sprint).where(Sprint.project_id == _ID, tuple_(Sprint.created_at, Sprint.id) > tuple_(_CREATED, _ID)).order_by(Sprint.created_at, Sprint.id).limit(101)),
+    ("user stories by sprint", select(UserStory).where(UserStory.sprint_id == _ID).order_by(UserStory.user_story_no).limit(101)),
+    ("tasks by user story", select(Task).where(Task.user_story_id == _ID).order_by(Task.task_no).limit(101)),
+    ("tasks by story and status", select(Task).where(Task.user_story_id == _ID, Task.status == "DONE")),
+    ("tasks page", select(Task).where(Task.task_no > 10000001).order_by(Task.task_no).limit(101)),
+    ("user stories page", select(UserStory).where(UserStory.user_story_no > 10000001).order_by(UserStory.user_story_no).limit(101)),
+    ("project export: tasks", select(Task).join(UserStory, Task.user_story_id == UserStory.id).join(Sprint, UserStory.sprint_id == Sprint.id).where(Sprint.project_id == _ID)),
+    ("search tasks", select(Task.id).where(Task.__table__.c.search_vector.op("@@")(to_query("login")))),
+    ("search user stories", select(UserStory.id).where(UserStory.__table__.c.search_vector.op("@@")(to_query("login")))),
+    ("FK check: tasks.assignee_id", select(Task.id).where(Task.assignee_id == _ID)),
+    ("FK check: user_stories.assignee_id", select(UserStory.id).where(UserStory.assignee_id == _ID)),
+    ("FK check: projects.created_by", select(Project.id).where(Project.created_by == _ID)),
+    ("FK check: users.role_id", select(User.id).where(User.role_id == _ID)),
+    ("FK check: users.last_modified_by", select(User.id).where(User.last_modified_by == _ID)),
+    ("delete task", delete(Task).where(Task.id == _ID)),
+]
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def check() -> list[tuple[str, list[str]]]:
+    dialect = postgresql.dialect()
+    failures = []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for label, stmt in HOT_QUERIES:
+            sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar_one()[0]["Plan"]
+            scans = _seq_scans(plan)
+            print(f"{'SEQ SCAN' if scans else 'ok':8}  {label}" + (f"  ({', '.join(scans)})" if scans else ""))
+            if scans:
+                failures.append((label, scans))
+        await conn.rollback()
+    await engine.dispose()
+    return failures
+
+
+def main() -> None:
+    failures = asyncio.run(check())
+    if failures:
+        print(f"\n{len(failures)} hot query(ies) fall back to a sequential scan", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""HTTP load test of the real app, with a baseline to catch regressions.
+
+Each scenario runs for ``--duration`` seconds with ``--concurrency``
+clients looping over its requests:
+
+* login: POST /auth/login for a pool of throwaway users (bcrypt-bound);
+* board: polling the active sprint's board and the project's sprint list;
+* grooming: reading the sprint backlog, re-prioritising stories and
+  moving tasks between statuses (writes the seeded data);
+* directory: paging through /users/, /projects/ and /roles/.
+
+Requests go to the app in-process over ASGI, or to a running server with
+``--url``.  Data comes from ``python -m benchmarks.seed``; a seed of
+20k tasks keeps the boards at a realistic size.  Throughput and
+p50/p95/p99 per route are written to ``--output`` as JSON and compared
+with ``--baseline``.  A route whose p95 grew, or whose throughput fell,
+by more than ``--threshold`` fails the run (exit status 1).
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.seed --name loadtest --tasks 20000 --sprints 20
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.loadtest --name loadtest --update-baseline
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.loadtest --name loadtest
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token, hash_password
+from app.main import app
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+from benchmarks.seed import DEFAULT_NAME, STATUSES
+
+SCENARIOS = ("login", "board", "grooming", "directory")
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "loadtest.json"
+# Pseudo-route for requests that got no response at all
+_TRANSPORT_ERROR = "<transport error>"
+
+_PASSWORD = "loadtest-password"
+_LOGIN_DOMAIN = "loadtest.invalid"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class Fixture:
+    """Ids and credentials the scenarios need, read from the seeded project."""
+
+    def __init__(self, project_id, owner_id, sprint_id, story_ids: list, task_ids: list, emails: list[str]):
+        self.project_id = project_id
+        self.sprint_id = sprint_id
+        self.story_ids = story_ids
+        self.task_ids = task_ids
+        self.emails = emails
+        self.headers = {"Authorization": f"Bearer {create_access_token({'sub': str(owner_id)})}"}
+
+
+async def load_fixture(name: str, users: int) -> Fixture:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Project.id, Project.created_by).where(Project.name == name).limit(1)
+        )
+        project = result.one_or_none()
+        if project is None:
+            raise SystemExit(f"no project named {name!r}; run python -m benchmarks.seed --name {name} first")
+        result = await session.execute(
+            select(Sprint.id).where(Sprint.project_id == project.id)
+            .order_by(Sprint.sprint_number.desc()).limit(1)
+        )
+        sprint_id = result.scalar_one()
+        story_ids = (await session.execute(
+            select(UserStory.id).where(UserStory.sprint_id == sprint_id)
+        )).scalars().all()
+        task_ids = (await session.execute(
+            select(Task.id).where(Task.user_story_id.in_(story_ids)).limit(1000)
+        )).scalars().all()
+
+        # One hash for every login user: setup stays fast, verification costs the same
+        password_hash = await hash_password(_PASSWORD)
+        emails = [f"{name}-{i}-{uuid4().hex[:6]}@{_LOGIN_DOMAIN}" for i in range(users)]
+        session.add_all(
+            User(id=uuid4(), name=f"{name} login {i}", email=email, password_hash=password_hash)
+            for i, email in enumerate(emails)
+        )
+        await session.commit()
+    return Fixture(project.id, project.created_by, sprint_id, list(story_ids), list(task_ids), emails)
+
+
+async def drop_login_users() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.email.like(f"%@{_LOGIN_DOMAIN}")))
+        await session.commit()
+
+
+# A step sends one request and returns (route label, response)
+Step = Callable[[httpx.AsyncClient, Fixture, random.Random], Awaitable[tuple[str, httpx.Response]]]
+
+
+async def _login(client, fx: Fixture, rng):
+    body = {"email": rng.choice(fx.emails), "password": _PASSWORD}
+    return "POST /auth/login", await client.post("/auth/login", json=body)
+
+
+async def _sprint_board(client, fx: Fixture, rng):
+    return "GET /board/sprint/{sprint_id}", await client.get(f"/board/sprint/{fx.sprint_id}", headers=fx.headers)
+
+
+async def _project_sprints(client, fx: Fixture, rng):
+    path = f"/sprints/project/{fx.project_id}"
+    return "GET /sprints/project/{project_id}", await client.get(path, headers=fx.headers)
+
+
+async def _sprint_backlog(client, fx: Fixture, rng):
+    path = f"/user-stories/sprint/{fx.sprint_id}"
+    return "GET /user-stories/sprint/{sprint_id}", await client.get(path, headers=fx.headers)
+
+
+async def _reprioritise_story(client, fx: Fixture, rng):
+    path = f"/user-stories/{rng.choice(fx.story_ids)}"
+    body = {"priority": rng.randint(1, 5)}
+    return "PATCH /user-stories/{user_story_id}", await client.patch(path, json=body, headers=fx.headers)
+
+
+async def _move_task(client, fx: Fixture, rng):
+    path = f"/tasks/{rng.choice(fx.task_ids)}"
+    body = {"status": rng.choice(STATUSES)}
+    return "PATCH /tasks/{task_id}", await client.patch(path, json=body, headers=fx.headers)
+
+
+async def _users_page(client, fx: Fixture, rng):
+    return "GET /users/", await client.get("/users/", params={"limit": 50}, headers=fx.headers)
+
+
+async def _projects(client, fx: Fixture, rng):
+    return "GET /projects/", await client.get("/projects/", params={"limit": 50}, headers=fx.headers)
+
+
+async def _roles(client, fx: Fixture, rng):
+    return "GET /roles/", await client.get("/roles/", headers=fx.headers)
+
+
+# Requests are issued in this order, round-robin; repeats weight the mix
+STEPS: dict[str, list[Step]] = {
+    "login": [_login],
+    "board": [_sprint_board, _sprint_board, _sprint_board, _project_sprints],
+    "grooming": [_sprint_backlog, _reprioritise_story, _move_task, _move_task],
+    "directory": [_users_page, _projects, _roles],
+}
+
+
+async def _client_loop(client, steps: list[Step], fx: Fixture, seed: int, deadline: float, samples: dict) -> None:
+    rng = random.Random(seed)
+    for step in itertools.islice(itertools.cycle(steps), rng.randrange(len(steps)), None):
+        if time.perf_counter() >= deadline:
+            return
+        started = time.perf_counter()
+        try:
+            route, response = await step(client, fx, rng)
+        except httpx.HTTPError:
+            samples[_TRANSPORT_ERROR].append((time.perf_counter() - started, 599))
+            continue
+        samples[route].append((time.perf_counter() - started, response.status_code))
+
+
+async def run_scenario(client, name: str, fx: Fixture, concurrency: int, duration: float) -> dict:
+    # Short warm-up so first-request costs (statement prep, pool growth) stay out
+    for step in STEPS[name]:
+        await step(client, fx, random.Random(0))
+    samples: dict[str, list[tuple[float, int]]] = defaultdict(list)
+    started = time.perf_counter()
+    deadline = started + duration
+    async with asyncio.TaskGroup() as group:
+        for i in range(concurrency):
+            group.create_task(_client_loop(client, STEPS[name], fx, i, deadline, samples))
+    elapsed = time.perf_counter() - started
+
+    routes = {}
+    for route, observed in samples.items():
+        latencies = [seconds for seconds, _ in observed]
+        routes[route] = {
+            "requests": len(observed),
+            "errors": sum(1 for _, status in observed if status >= 400),
+            "rps": round(len(observed) / elapsed, 2),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {"requests": total, "rps": round(total / elapsed, 2), "routes": routes}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every route that regressed beyond ``threshold`` against ``baseline``.
+
+    A baseline route that the same scenario no longer reached (renamed, or
+    every request to it failed in transport) counts as a regression too.
+    """
+    regressions = []
+    for scenario, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if before is None:
+            continue
+        for route in sorted(before["routes"].keys() - current["routes"].keys() - {_TRANSPORT_ERROR}):
+            regressions.append(f"{scenario} {route}: in the baseline but missing from this run")
+        for route, now in current["routes"].items():
+            then = before["routes"].get(route)
+            if then is None:
+                continue
+            if then["p95_ms"] > 0 and now["p95_ms"] > then["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{scenario} {route}: p95 {then['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms"
+                )
+            if now["rps"] < then["rps"] * (1 - threshold):
+                regressions.append(f"{scenario} {route}: {then['rps']:.1f} -> {now['rps']:.1f} req/s")
+            if now["errors"] and not then["errors"]:
+                regressions.append(f"{scenario} {route}: {now['errors']} errors, none in the baseline")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    fx = await load_fixture(args.name, args.users)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+    try:
+        async with client:
+            for name in args.scenarios:
+                results["scenarios"][name] = await run_scenario(client, name, fx, args.concurrency, args.duration)
+    finally:
+        await drop_login_users()
+        await engine.dispose()
+    return results
+
+
+def _print_report(results: dict) -> None:
+    print(f"{'scenario':10} {'route':38} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for scenario, summary in results["scenarios"].items():
+        for route, r in sorted(summary["routes"].items()):
+            print(
+                f"{scenario:10} {route:38} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} "
+                f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", default=DEFAULT_NAME, help="seeded project name")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20, help="clients per scenario")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--users", type=int, default=50, help="throwaway users for the login scenario")
+    parser.add_argument("--url", help="base URL of a running server (default: the app in-process)")
+    parser.add_argument("--output", type=Path, default=Path("loadtest-results.json"))
+    parser.add_argument("--baseline", type=Path, help="baseline to compare with (default: benchmarks/baselines/loadtest.json)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+    explicit_baseline = args.baseline is not None
+    if not explicit_baseline:
+        args.baseline = DEFAULT_BASELINE
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+    _print_report(results)
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline updated: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        # A missing default baseline is a first run; a missing explicit one is an error
+        if explicit_baseline:
+            sys.exit(1)
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Microbenchmarks of the per-request CPU hot paths, with a history file.
+
+Times each case with an automatically chosen loop count, ``--rounds`` times,
+and reports the best and median time per call.  No database is needed: the
+inputs are synthetic, at realistic sizes (the 12 permissions, lists of
+``--rows`` tasks, stories and users, week-long access tokens).
+
+Each run appends one line to ``--history`` (JSON, with the commit and
+machine) and prints the change against the last recorded run from the
+same machine, so a change to app/core can be judged by numbers.  Commit the
+new history line along with the change.  ``-k`` selects cases by substring,
+as in pytest.
+
+    DATABASE_URL=postgresql+asyncpg://u:p@localhost/db python -m benchmarks.micro
+    DATABASE_URL=... python -m benchmarks.micro -k token --no-record
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.core.dependencies import TokenPrincipal
+from app.core.permissions import ALL_PERMISSIONS, CompiledRole, mask_to_permissions_map, permissions_to_mask
+from app.core.security import create_access_token, decode_access_token
+from app.core.serialization import Serializer
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+from app.schemas.task import TaskOut
+from app.schemas.user import UserOut, user_payload
+from app.schemas.user_story import UserStoryOut
+
+DEFAULT_HISTORY = Path(__file__).parent / "history" / "micro.jsonl"
+
+# Roughly how long one timed round of a case runs
+_ROUND_SECONDS = 0.2
+
+
+def _tasks(count: int) -> list[Task]:
+    story_id = uuid4()
+    start = datetime(2026, 1, 1)
+    return [
+        Task(
+            id=uuid4(), task_no=10000001 + i, user_story_id=story_id,
+            title=f"Task {i}: update the settings page",
+            description="Make the filter remember its state between visits. " * 3,
+            status=("TODO", "IN_PROGRESS", "DONE")[i % 3], estimated_hours=i % 13,
+            created_at=start + timedelta(minutes=i), assignee_id=uuid4() if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def _stories(count: int) -> list[UserStory]:
+    sprint_id = uuid4()
+    start = datetime(2026, 1, 1)
+    return [
+        UserStory(
+            id=uuid4(), user_story_no=10000001 + i, sprint_id=sprint_id,
+            title=f"As a user I want story {i}", description="So that the board reflects reality. " * 4,
+            status=("TODO", "IN_PROGRESS", "DONE")[i % 3], priority=1 + i % 5,
+            created_at=start + timedelta(minutes=i), assignee_id=uuid4() if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def _users(count: int, role_id) -> list[User]:
+    start = datetime(2026, 1, 1)
+    return [
+        User(
+            id=uuid4(), name=f"User {i}", email=f"user{i}@example.com", role_id=role_id if i % 4 else None,
+            status="ACTIVE", last_modified_on=start, last_modified_by=None, avatar_url=None,
+            auth_provider="local", created_at=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def build_cases(rows: int) -> dict[str, Callable[[], Any]]:
+    """Case name → zero-argument callable; names are stable keys in the history."""
+    granted = ALL_PERMISSIONS[::2]
+    mask = permissions_to_mask(granted)
+    role_id = str(uuid4())
+    role = CompiledRole(role_id, "Developer", 3, mask, frozenset(granted))
+    token = create_access_token({"sub": str(uuid4())})
+    stateless_token = create_access_token(
+        {"sub": str(uuid4())}, role_id=role_id, role_name="Developer", permissions_mask=mask, permissions_version=3
+    )
+    principal = TokenPrincipal(str(uuid4()), role_id, "Developer", mask, stateless=True)
+
+    tasks, stories, users = _tasks(rows), _stories(rows), _users(rows, role_id)
+    roles = {role_id: role}
+    task_list = TypeAdapter(list[TaskOut])
+    story_list = TypeAdapter(list[UserStoryOut])
+    user_list = TypeAdapter(list[UserOut])
+    tasks_json, stories_json = Serializer(TaskOut, many=True), Serializer(UserStoryOut, many=True)
+    users_json = Serializer(UserOut, many=True)
+
+    def user_payloads():
+        return [user_payload(u, roles.get(str(u.role_id))) for u in users]
+
+    return {
+        "token.create": lambda: create_access_token({"sub": role_id}),
+        "token.decode": lambda: decode_access_token(token),
+        "token.decode_stateless": lambda: decode_access_token(stateless_token),
+        "permissions.to_mask": lambda: permissions_to_mask(granted),
+        "permissions.map": lambda: mask_to_permissions_map(mask),
+        "permissions.compiled_role": lambda: CompiledRole(role_id, "Developer", 3, mask, frozenset(granted)).permissions,
+        "permissions.principal_has": lambda: principal.has("task:write"),
+        f"users.payload[{rows}]": user_payloads,
+        f"users.validate[{rows}]": lambda: user_list.validate_python(user_payloads()),
+        f"users.serialize[{rows}]": lambda: users_json.dump_json(user_payloads()),
+        f"tasks.validate[{rows}]": lambda: task_list.dump_json(task_list.validate_python(tasks, from_attributes=True)),
+        f"tasks.serialize[{rows}]": lambda: tasks_json.dump_json(tasks),
+        f"stories.validate[{rows}]": lambda: story_list.dump_json(story_list.validate_python(stories, from_attributes=True)),
+        f"stories.serialize[{rows}]": lambda: stories_json.dump_json(stories),
+    }
+
+
+def measure(case: Callable[[], Any], rounds: int) -> dict[str, float]:
+    """Seconds per call: the best and the median round."""
+    case()  # warm up
+    loops, started = 1, time.perf_counter()
+    case()
+    elapsed = time.perf_counter() - started
+    if elapsed > 0:
+        loops = max(1, int(_ROUND_SECONDS / elapsed))
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            case()
+        samples.append((time.perf_counter() - started) / loops)
+    return {"best": min(samples), "median": statistics.median(samples), "loops": loops}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _machine() -> str:
+    return f"{platform.node()} {platform.machine()} {platform.python_implementation()} {platform.python_version()}"
+
+
+def _last_run(history: Path, machine: str) -> Optional[dict]:
+    if not history.exists():
+        return None
+    last = None
+    for line in history.read_text().splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if entry.get("machine") == machine:
+                last = entry
+    return last
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:2}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", default="", help="only cases whose name contains this")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the list cases")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args()
+
+    machine = _machine()
+    previous = _last_run(args.history, machine)
+    before = previous["results"] if previous else {}
+    if previous:
+        print(f"compared with {previous['commit']} ({previous['recorded_at']})")
+
+    results = {}
+    print(f"{'case':32} {'best':>11} {'median':>11} {'change':>8}")
+    for name, case in build_cases(args.rows).items():
+        if args.keyword not in name:
+            continue
+        result = measure(case, args.rounds)
+        results[name] = {"best": result["best"], "median": result["median"]}
+        change = ""
+        if name in before:
+            change = f"{result['median'] / before[name]['median'] - 1:+.1%}"
+        print(f"{name:32} {_format(result['best'])} {_format(result['median'])} {change:>8}")
+
+    if not args.no_record and results:
+        entry = {
+            "commit": _git_commit(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": machine,
+            "rows": args.rows,
+            "results": results,
+        }
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a") as history:
+            history.write(json.dumps(entry) + "\n")
+        print(f"recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Latency of unrelated requests while a login storm is hashing passwords.
+
+Sends ``GET /`` probes to the real app (in-process, over ASGI) while
+``--logins`` concurrent callers keep verifying bcrypt passwords, once with
+the verification inline on the event loop (the old behaviour) and once
+through the hashing executor in app.core.security.  No database is needed.
+
+    python -m benchmarks.password_hashing --logins 32 --probes 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.core.security import (
+    PasswordHasherBusy,
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+from app.main import app
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _storm(mode: str, hashed: str, stop: asyncio.Event, counters: dict) -> None:
+    while not stop.is_set():
+        if mode == "inline":
+            verify_password("correct horse", hashed)
+            await asyncio.sleep(0)
+        else:
+            try:
+                await verify_and_update_password("correct horse", hashed)
+            except PasswordHasherBusy:
+                counters["rejected"] += 1
+                await asyncio.sleep(0.05)
+                continue
+        counters["logins"] += 1
+
+
+async def run(mode: str, logins: int, probes: int, interval: float) -> dict:
+    hashed = get_password_hash("correct horse")
+    stop = asyncio.Event()
+    counters = {"logins": 0, "rejected": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/")  # warm up routing before measuring
+        storm = [asyncio.create_task(_storm(mode, hashed, stop, counters)) for _ in range(logins)]
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(probes):
+            t0 = time.perf_counter()
+            await client.get("/")
+            latencies.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(interval)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*storm)
+
+    return {
+        "mode": mode,
+        "probe_p50_ms": round(statistics.median(latencies), 2),
+        "probe_p99_ms": round(_percentile(latencies, 99), 2),
+        "probe_max_ms": round(max(latencies), 2),
+        "logins_per_second": round(counters["logins"] / elapsed, 1),
+        "rejected_503": counters["rejected"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login callers")
+    parser.add_argument("--probes", type=int, default=100, help="GET / requests to time")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between probes")
+    args = parser.parse_args()
+
+    for mode in ("inline", "executor"):
+        result = asyncio.run(run(mode, args.logins, args.probes, args.interval))
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
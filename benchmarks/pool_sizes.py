@@ -0,0 +1,80 @@
+"""Throughput of a typical read at different connection pool sizes.
+
+For each ``--sizes`` entry an engine is built with the app's settings but
+that pool size (and no overflow), then ``--concurrency`` callers run the
+tasks-page query for ``--duration`` seconds.  Reported per size: queries per
+second, p50/p99 latency including the wait for a connection, and how many
+calls gave up after ``--pool-timeout`` seconds.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.pool_sizes --sizes 2,5,10,20 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.database import build_engine
+from app.models.task import Task
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _caller(engine, stmt, deadline: float, latencies: list[float], counters: dict) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                (await conn.execute(stmt)).all()
+        except PoolTimeoutError:
+            counters["timeouts"] += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(size: int, concurrency: int, duration: float, pool_timeout: float) -> dict:
+    engine = build_engine(pool_size=size, max_overflow=0, pool_timeout=pool_timeout)
+    stmt = select(Task).order_by(Task.task_no).limit(100)
+    try:
+        # Open the pool up front so connection setup is not measured
+        conns = [engine.connect() for _ in range(size)]
+        await asyncio.gather(*(conn.start() for conn in conns))
+        await asyncio.gather(*(conn.close() for conn in conns))
+        latencies: list[float] = []
+        counters = {"timeouts": 0}
+        deadline = time.perf_counter() + duration
+        async with asyncio.TaskGroup() as group:
+            for _ in range(concurrency):
+                group.create_task(_caller(engine, stmt, deadline, latencies, counters))
+    finally:
+        await engine.dispose()
+    return {
+        "size": size,
+        "qps": len(latencies) / duration,
+        "p50_ms": _percentile(latencies, 50) * 1000 if latencies else float("nan"),
+        "p99_ms": _percentile(latencies, 99) * 1000 if latencies else float("nan"),
+        "timeouts": counters["timeouts"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="2,5,10,20", help="comma-separated pool sizes")
+    parser.add_argument("--concurrency", type=int, default=50, help="parallel callers")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per pool size")
+    parser.add_argument("--pool-timeout", type=float, default=5.0, help="seconds to wait for a connection")
+    args = parser.parse_args()
+
+    print(f"{'pool':>5} {'qps':>9} {'p50 ms':>9} {'p99 ms':>9} {'timeouts':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        r = asyncio.run(run(size, args.concurrency, args.duration, args.pool_timeout))
+        print(f"{r['size']:>5} {r['qps']:>9.1f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['timeouts']:>9}")
+
+
+if __name__ == "__main__":
+    main()
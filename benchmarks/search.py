@@ -0,0 +1,94 @@
+"""Latency of GET /search/ against a seeded project.
+
+Runs each query ``--repeat`` times through the real app (response cache
+off), scoped to the whole project and to its last sprint, and prints
+p50/p95 in milliseconds with the number of hits on the first page.  Seed
+the data first with ``python -m benchmarks.seed``.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.search --repeat 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# Measure the database, not the cache; set before the app reads its config
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+import httpx
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.project import Project
+from app.models.sprint import Sprint
+from benchmarks.seed import DEFAULT_NAME
+
+# From very common to rare words of benchmarks.seed.VOCABULARY, plus the
+# web-search syntax variants and a term that matches nothing.
+QUERIES = [
+    "update",
+    "login error",
+    '"reset password"',
+    "payment -mobile",
+    "invoice or refund",
+    "webhook",
+    "nomatchword",
+]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+async def run(name: str, repeat: int, limit: int) -> None:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Project.id, Project.created_by).where(Project.name == name).limit(1)
+        )
+        project = result.one_or_none()
+        if project is None:
+            raise SystemExit(f"no project named {name!r}; run python -m benchmarks.seed first")
+        result = await session.execute(
+            select(Sprint.id).where(Sprint.project_id == project.id)
+            .order_by(Sprint.sprint_number.desc()).limit(1)
+        )
+        sprint_id = result.scalar_one()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(project.created_by)})}"}
+    scopes = [("project", {"project_id": str(project.id)}), ("sprint", {"sprint_id": str(sprint_id)})]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"{'scope':8} {'query':22} {'hits':>5} {'p50 ms':>8} {'p95 ms':>8}")
+        for scope, params in scopes:
+            for query in QUERIES:
+                request = {"q": query, "limit": limit, **params}
+                warm = await client.get("/search/", params=request, headers=headers)
+                warm.raise_for_status()
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get("/search/", params=request, headers=headers)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                print(
+                    f"{scope:8} {query:22} {len(warm.json()):>5} "
+                    f"{statistics.median(samples):>8.1f} {_percentile(samples, 95):>8.1f}"
+                )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", default=DEFAULT_NAME, help="seeded project name")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    args = parser.parse_args()
+    asyncio.run(run(args.name, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
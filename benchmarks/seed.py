@@ -0,0 +1,139 @@
+"""Generate a large synthetic project to benchmark against.
+
+Creates one user and one project holding ``--sprints`` sprints,
+``--stories`` stories per sprint and enough tasks per story to reach
+``--tasks`` in total, with random titles and descriptions drawn from a
+small vocabulary.  Words are Zipf-like skewed: the first words of
+``VOCABULARY`` appear in a large share of rows, the last ones in few, so
+searches can be timed for both common and rare terms.  Rows are generated
+server-side, one sprint per statement.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.seed --tasks 1000000
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.seed --drop
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, select, text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_story import UserStory
+
+DEFAULT_NAME = "bench-seed"
+
+# Most common first
+VOCABULARY = [
+    "update", "fix", "add", "page", "user", "error", "list", "button", "form", "view",
+    "data", "test", "check", "api", "screen", "report", "login", "search", "settings", "filter",
+    "profile", "email", "mobile", "export", "import", "sprint", "board", "status", "upload", "cache",
+    "admin", "password", "reset", "notification", "dashboard", "invoice", "payment", "calendar", "chart", "session",
+    "timezone", "avatar", "billing", "onboarding", "audit", "locale", "webhook", "refund", "captcha", "sitemap",
+]
+STATUSES = ["TODO", "IN_PROGRESS", "DONE"]
+
+_WORDS = "ARRAY[" + ", ".join(f"'{w}'" for w in VOCABULARY) + "]"
+_STATUSES = "ARRAY[" + ", ".join(f"'{s}'" for s in STATUSES) + "]"
+
+
+def _phrase(words: int, seed_column: str) -> str:
+    # random()^3 skews towards the start of the vocabulary.  The subquery
+    # must reference the outer row, or Postgres evaluates it only once.
+    return (
+        f"(SELECT string_agg(({_WORDS})[1 + floor(power(random(), 3) * {len(VOCABULARY)})::int], ' ') "
+        f"FROM generate_series(1, {words} + ({seed_column} % 3)))"
+    )
+
+
+_INSERT_STORIES = text(f"""
+    INSERT INTO boards.user_stories (id, sprint_id, title, description, status, priority)
+    SELECT gen_random_uuid(), :sprint_id, {_phrase(4, 'g')}, {_phrase(20, 'g')},
+           ({_STATUSES})[1 + floor(random() * {len(STATUSES)})::int], 1 + floor(random() * 5)::int
+    FROM generate_series(1, :stories) AS g
+""")
+
+_INSERT_TASKS = text(f"""
+    INSERT INTO boards.tasks (id, user_story_id, title, description, status, estimated_hours)
+    SELECT gen_random_uuid(), us.id, {_phrase(4, 'g')}, {_phrase(20, 'g')},
+           ({_STATUSES})[1 + floor(random() * {len(STATUSES)})::int], 1 + floor(random() * 16)::int
+    FROM boards.user_stories us CROSS JOIN generate_series(1, :per_story) AS g
+    WHERE us.sprint_id = :sprint_id
+""")
+
+
+async def seed(name: str, tasks: int, sprints: int, stories: int) -> Project:
+    per_story = max(1, tasks // (sprints * stories))
+    user = User(id=uuid4(), name=name, email=f"{name}-{uuid4().hex[:8]}@bench.invalid")
+    project = Project(id=uuid4(), name=name, created_by=user.id)
+    async with AsyncSessionLocal() as session:
+        session.add(user)
+        await session.flush()
+        session.add(project)
+        await session.commit()
+
+    started = time.perf_counter()
+    for number in range(1, sprints + 1):
+        sprint = Sprint(id=uuid4(), name=f"Sprint {number}", project_id=project.id,
+                        status="COMPLETED" if number < sprints else "ACTIVE", sprint_number=number)
+        async with AsyncSessionLocal() as session:
+            session.add(sprint)
+            await session.flush()
+            await session.execute(_INSERT_STORIES, {"sprint_id": sprint.id, "stories": stories})
+            await session.execute(_INSERT_TASKS, {"sprint_id": sprint.id, "per_story": per_story})
+            await session.commit()
+        if number % 10 == 0 or number == sprints:
+            print(f"  {number}/{sprints} sprints, {number * stories * per_story} tasks, "
+                  f"{time.perf_counter() - started:.0f}s", flush=True)
+
+    async with engine.connect() as conn:
+        # Fresh statistics, so the planner sees the new row counts at once
+        await conn.execute(text("ANALYZE boards.user_stories"))
+        await conn.execute(text("ANALYZE boards.tasks"))
+    return project
+
+
+async def drop(name: str) -> int:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Project.id, Project.created_by).where(Project.name == name))
+        projects = result.all()
+        for project_id, user_id in projects:
+            sprint_ids = select(Sprint.id).where(Sprint.project_id == project_id)
+            story_ids = select(UserStory.id).where(UserStory.sprint_id.in_(sprint_ids))
+            await session.execute(delete(Task).where(Task.user_story_id.in_(story_ids)))
+            await session.execute(delete(UserStory).where(UserStory.sprint_id.in_(sprint_ids)))
+            await session.execute(delete(Sprint).where(Sprint.project_id == project_id))
+            await session.execute(delete(Project).where(Project.id == project_id))
+            await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+    return len(projects)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", default=DEFAULT_NAME, help="project name (also used by --drop)")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="total tasks")
+    parser.add_argument("--sprints", type=int, default=250)
+    parser.add_argument("--stories", type=int, default=40, help="stories per sprint")
+    parser.add_argument("--drop", action="store_true", help="delete projects with this name instead")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            if args.drop:
+                print(f"dropped {await drop(args.name)} project(s) named {args.name!r}")
+            else:
+                project = await seed(args.name, args.tasks, args.sprints, args.stories)
+                print(f"project {project.id} ({args.name!r})")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
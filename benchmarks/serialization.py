@@ -0,0 +1,88 @@
+"""Rows per second when encoding a list of tasks as a response body.
+
+Builds ``--rows`` transient Task objects (no database needed) and times:
+
+* fastapi: what FastAPI does for ``response_model=list[TaskOut]`` — validate,
+  serialize to Python, encode with ``json`` (the old path);
+* fastapi+orjson: the same with ORJSONResponse as the response class;
+* serializer: app.core.serialization.Serializer, used by the list routes,
+  the response cache, boards and /users — no validation, fields copied out
+  of the loaded ORM state and encoded by pydantic-core.
+
+    python -m benchmarks.serialization --rows 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.serialization import ORJSONResponse, Serializer
+from app.models.task import Task
+from app.schemas.task import TaskOut
+
+
+def make_tasks(count: int) -> list[Task]:
+    story_id = uuid4()
+    start = datetime(2026, 1, 1)
+    return [
+        Task(
+            id=uuid4(),
+            task_no=10000001 + i,
+            user_story_id=story_id,
+            title=f"Task {i}: update the settings page",
+            description="Make the filter remember its state between visits. " * 3,
+            status=("TODO", "IN_PROGRESS", "DONE")[i % 3],
+            estimated_hours=i % 13,
+            created_at=start + timedelta(minutes=i),
+            assignee_id=uuid4() if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+async def measure(rows: int, repeat: int) -> dict[str, float]:
+    tasks = make_tasks(rows)
+    field = create_model_field(name="Response", type_=list[TaskOut], mode="serialization")
+    serializer = Serializer(TaskOut, many=True)
+
+    async def fastapi(response_class) -> bytes:
+        content = await serialize_response(field=field, response_content=tasks)
+        return response_class(content).body
+
+    cases = {
+        "fastapi": lambda: fastapi(JSONResponse),
+        "fastapi+orjson": lambda: fastapi(ORJSONResponse),
+        "serializer": lambda: asyncio.sleep(0, serializer.dump_json(tasks)),
+    }
+    results = {}
+    for name, case in cases.items():
+        await case()  # warm up
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await case()
+            samples.append(time.perf_counter() - started)
+        results[name] = rows / statistics.median(samples)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(measure(args.rows, args.repeat))
+    baseline = results["fastapi"]
+    for name, rate in results.items():
+        print(f"{name:16} {rate:>12,.0f} rows/s  {rate / baseline:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
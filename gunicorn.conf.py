@@ -0,0 +1,81 @@
+"""Production server settings: ``gunicorn app.main:app`` picks this file up.
+
+One uvicorn worker process per CPU of the container's cgroup CPU quota, or
+2 when there is no quota to read (override with WEB_CONCURRENCY), each
+running its own event loop and connection pool.
+Every setting below can be overridden with the environment variable named
+next to it.
+
+Signals: SIGTERM/SIGINT stop gracefully.  The workers stop accepting, let
+in-flight requests finish for up to GRACEFUL_TIMEOUT seconds, then run the
+app's lifespan shutdown, which disposes the database pools.  SIGHUP reloads
+the configuration and the code by replacing workers one by one, with the
+same draining.
+"""
+import math
+import os
+
+# Workers when the CPU quota is unknown.  The CPU count and affinity mask
+# describe the host, not the container's share of it, so they are no guide.
+_DEFAULT_WORKERS = 2
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read().strip()
+
+
+def _cpu_quota() -> float | None:
+    """CPUs granted by the cgroup CPU quota (v2, then v1), or None if unlimited."""
+    try:
+        quota, _, period = _read("/sys/fs/cgroup/cpu.max").partition(" ")
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(_read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us"))
+        return None if quota <= 0 else quota / int(_read("/sys/fs/cgroup/cpu/cpu.cfs_period_us"))
+    except (OSError, ValueError):
+        return None
+
+
+def _workers() -> int:
+    quota = _cpu_quota()
+    return max(1, math.ceil(quota)) if quota else _DEFAULT_WORKERS
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or _workers())
+worker_class = "app.core.server.Worker"
+
+# The app reads these when a worker imports it: each worker's pool gets its
+# share of DB_MAX_CONNECTIONS (see app/core/config.py).
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Longer than the idle timeout of the proxy in front of us, so the proxy
+# closes idle connections first and never reuses one we just dropped.
+keepalive = int(os.getenv("KEEP_ALIVE", "75"))
+# Connections the kernel queues while every worker is busy.
+backlog = int(os.getenv("BACKLOG", "2048"))
+# Seconds a silent worker may take before being restarted, and seconds a
+# stopping worker gets to finish its requests.
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# Restart each worker after this many requests (0 = never); the jitter keeps
+# workers from restarting together.
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    budget = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+    if budget > 0:
+        server.log.info(
+            "%d workers sharing DB_MAX_CONNECTIONS=%d (%d per worker)", workers, budget, max(1, budget // workers)
+        )
+    else:
+        server.log.info("%d workers; set DB_MAX_CONNECTIONS to cap their connection pools", workers)
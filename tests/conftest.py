@@ -0,0 +1,86 @@
+"""Fixtures for tests that drive the app against a real Postgres.
+
+Point DATABASE_URL (environment or .env) at a migrated scratch database
+(``alembic upgrade head``); the tests are skipped when it is unset or
+unreachable.  The app is imported lazily because the engine is created at
+import time and needs that URL.
+"""
+import os
+from uuid import uuid4
+
+import pytest
+
+# Exercise the database, not the response cache; set before the app reads its config
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database(anyio_backend):
+    import app.core.config  # noqa: F401  (loads .env)
+
+    if not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+
+    from sqlalchemy import text
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.core.database import engine
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, SQLAlchemyError) as exc:
+        pytest.skip(f"database unavailable: {exc}")
+    yield engine
+    # Connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(database):
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        yield client
+
+
+@pytest.fixture
+async def project(database):
+    """A scratch user and project; removed, with the project's sprints, afterwards."""
+    from sqlalchemy import delete
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.project import Project
+    from app.models.sprint import Sprint
+    from app.models.user import User
+
+    user = User(id=uuid4(), name="test", email=f"{uuid4()}@test.invalid")
+    project = Project(id=uuid4(), name="test", created_by=user.id)
+    async with AsyncSessionLocal() as session:
+        session.add(user)
+        await session.flush()
+        session.add(project)
+        await session.commit()
+    try:
+        yield project
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(Sprint).where(Sprint.project_id == project.id))
+            await session.execute(delete(Project).where(Project.id == project.id))
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+
+
+@pytest.fixture
+def auth_headers(project):
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(project.created_by)})}"}
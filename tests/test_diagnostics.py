@@ -0,0 +1,20 @@
+import pytest
+
+from app.core.diagnostics import assert_max_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sprints_by_project_stays_within_its_query_budget(client, project, auth_headers):
+    with assert_max_queries(3) as statements:
+        response = await client.get(f"/sprints/project/{project.id}", headers=auth_headers)
+    assert response.status_code == 200
+    # Loading the user, the list's ETag aggregate, the page
+    assert len(statements) == 3
+
+
+async def test_assert_max_queries_reports_the_statements_over_budget(client, project, auth_headers):
+    with pytest.raises(AssertionError, match="3 queries, expected at most 1") as excinfo:
+        with assert_max_queries(1):
+            await client.get(f"/sprints/project/{project.id}", headers=auth_headers)
+    assert "boards.sprints" in str(excinfo.value)
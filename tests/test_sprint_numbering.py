@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+pytestmark = pytest.mark.anyio
+
+CREATES = 50
+
+
+async def test_concurrent_creates_number_sprints_without_duplicates_or_gaps(client, project, auth_headers):
+    from app.core.database import AsyncSessionLocal
+    from app.models.sprint import Sprint
+
+    responses = await asyncio.gather(*(
+        client.post(
+            "/sprints/",
+            json={"name": f"Sprint {i}", "project_id": str(project.id), "status": "PLANNED"},
+            headers=auth_headers,
+        )
+        for i in range(CREATES)
+    ))
+    assert [r.status_code for r in responses] == [200] * CREATES
+
+    # sprint_number is not part of SprintOut
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Sprint.sprint_number).where(Sprint.project_id == project.id))
+        numbers = sorted(result.scalars().all())
+    assert numbers == list(range(1, CREATES + 1))